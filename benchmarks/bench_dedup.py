@@ -0,0 +1,157 @@
+"""Near-duplicate lookup: MinHash/LSH bucket index vs comparing against every open complaint.
+
+    DATABASE_URL=postgresql://.../complaint_bench python -m benchmarks.bench_dedup --complaints 100000
+    python -m benchmarks.bench_dedup --sqlite /tmp/bench_dedup.sqlite --complaints 20000 --json
+
+Seeds complaints where --duplicate-ratio of them are lightly edited copies of
+earlier ones, rebuilds the index, then times lookups for new edited copies and
+fresh texts. The linear baseline computes exact shingle Jaccard against every
+open complaint held in memory, so it is a lower bound on what a scan costs;
+its matches are also the ground truth for the LSH recall figure.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+
+def perturb(rng, text, words):
+    """A near-duplicate: one word swapped, one dropped and the casing changed."""
+    tokens = text.split()
+    if len(tokens) > 4:
+        tokens[rng.randrange(len(tokens))] = rng.choice(words)
+        del tokens[rng.randrange(len(tokens))]
+    text = " ".join(tokens)
+    return text.upper() if rng.random() < 0.3 else text
+
+
+def seed_complaints(db, models, count, duplicate_ratio, rng, words):
+    """Insert count open complaints; returns [(complaint_id, text)] in creation order."""
+    UserModel, ComplaintModel, UserRole, ComplaintStatus = models
+    sender_id = uuid.uuid4()
+    db.session.execute(db.insert(UserModel), [{
+        "users_id": sender_id, "users_name": "dedup bench", "users_email": f"dedup.{sender_id.hex}@bench.edu",
+        "users_password": "x", "users_role": UserRole.student}])
+    start = datetime.now(timezone.utc) - timedelta(days=30)
+    texts = []
+    rows = []
+    for i in range(count):
+        if texts and rng.random() < duplicate_ratio:
+            text = perturb(rng, rng.choice(texts)[1], words)
+        else:
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(12, 30)))
+        complaint_id = uuid.uuid4()
+        texts.append((complaint_id, text))
+        rows.append({"complaint_id": complaint_id, "sender_id": sender_id, "complaint_message": text,
+                     "complaint_status": ComplaintStatus.under_checking,
+                     "complaint_created_at": start + timedelta(seconds=i)})
+        if len(rows) == 5000:
+            db.session.execute(db.insert(ComplaintModel), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(ComplaintModel), rows)
+    db.session.commit()
+    return texts
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[max(0, int(len(timings) * 0.95) - 1)],
+        "queries": len(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sqlite", metavar="PATH", help="run against a fresh SQLite file instead of DATABASE_URL")
+    parser.add_argument("--complaints", type=int, default=100000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.2)
+    parser.add_argument("--queries", type=int, default=200, help="LSH lookups to time")
+    parser.add_argument("--linear-queries", type=int, default=20,
+                        help="lookups also answered by the linear scan (slow at scale)")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    from benchmarks import sqlite_compat
+    if args.sqlite or not os.environ.get("DATABASE_URL"):
+        sqlite_compat.use_sqlite(args.sqlite or os.path.join(tempfile.gettempdir(), "complaints_bench_dedup.sqlite"))
+    os.environ.setdefault("SLOW_QUERY_MS", "0")
+
+    from api import (app, db, min_hasher, complaint_text, find_duplicates, rebuild_duplicate_index,
+                     UserModel, ComplaintModel, UserRole, ComplaintStatus)
+    from benchmarks.seed import WORDS
+    from dedup import shingles
+
+    rng = random.Random(11)
+    with app.app_context():
+        sqlite_compat.create_schema(db)
+        texts = seed_complaints(db, (UserModel, ComplaintModel, UserRole, ComplaintStatus), args.complaints,
+                                args.duplicate_ratio, rng, WORDS)
+
+        start = time.perf_counter()
+        indexed, clustered = rebuild_duplicate_index()
+        rebuild_s = time.perf_counter() - start
+
+        # half edited copies of stored complaints, half unrelated texts
+        queries = [perturb(rng, rng.choice(texts)[1], WORDS) if i % 2 == 0 else
+                   " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 30))) for i in range(args.queries)]
+
+        signature_ms, lsh_ms, lsh_results = [], [], []
+        for text in queries:
+            start = time.perf_counter()
+            signature = min_hasher.signature(complaint_text(None, text))
+            signature_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            lsh_results.append({complaint_id for complaint_id, _, _ in find_duplicates(signature)})
+            lsh_ms.append((time.perf_counter() - start) * 1000)
+            db.session.rollback()
+
+        threshold = app.config["DEDUP_THRESHOLD"]
+        stored = [(complaint_id, shingles(complaint_text(None, text))) for complaint_id, text in texts]
+        linear_ms, found, expected, false_positives = [], 0, 0, 0
+        for text, lsh_found in zip(queries[:args.linear_queries], lsh_results):
+            start = time.perf_counter()
+            query = shingles(complaint_text(None, text))
+            exact = {complaint_id for complaint_id, other in stored
+                     if len(query & other) / len(query | other) >= threshold}
+            linear_ms.append((time.perf_counter() - start) * 1000)
+            expected += len(exact)
+            found += len(exact & lsh_found)
+            false_positives += len(lsh_found - exact)
+
+    results = {
+        "complaints": indexed,
+        "clusters_with_duplicates": clustered,
+        "rebuild_s": rebuild_s,
+        "rebuild_per_sec": indexed / rebuild_s if rebuild_s else None,
+        "signature": summarize(signature_ms),
+        "lsh_lookup": summarize(lsh_ms),
+        "linear_scan": summarize(linear_ms) if linear_ms else None,
+        "recall": found / expected if expected else None,
+        "false_positives": false_positives,
+        "threshold": threshold,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{indexed} complaints indexed in {rebuild_s:.1f}s ({results['rebuild_per_sec']:.0f}/s), "
+          f"{clustered} clusters with duplicates")
+    for name in ("signature", "lsh_lookup", "linear_scan"):
+        r = results[name]
+        if r:
+            print(f"{name:>12}: median {r['median_ms']:.2f}ms  p95 {r['p95_ms']:.2f}ms  ({r['queries']} queries)")
+    if results["recall"] is not None:
+        print(f"recall vs exact Jaccard >= {threshold}: {results['recall']:.3f}, "
+              f"{false_positives} matches below the threshold")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Cost of deleting a student with a large history: ORM-loaded cascade vs database cascade vs batched purge.
+
+    DATABASE_URL=postgresql://.../complaint_bench python -m benchmarks.bench_delete \\
+        --notifications 50000 --complaints 2000 --sessions 200 --messages 100
+    python -m benchmarks.bench_delete --sqlite /tmp/bench_delete.sqlite --json
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+
+
+def create_history(db, models, notifications, complaints, sessions, messages):
+    """Insert one student with the given amount of history and return its users_id."""
+    (UserModel, ComplaintModel, NotificationModel, SuggestionModel, ChatSessionModel, ChatMessageModel,
+     UserRole, ComplaintType, ComplaintDep, ComplaintStatus, SenderType) = models
+    now = datetime.now(timezone.utc)
+    users_id = uuid.uuid4()
+    db.session.execute(db.insert(UserModel), [{
+        "users_id": users_id, "users_name": "heavy student", "users_email": f"heavy.{users_id.hex}@bench.edu",
+        "users_password": "x", "users_role": UserRole.student}])
+
+    def insert(model, rows):
+        for start in range(0, len(rows), 5000):
+            db.session.execute(db.insert(model), rows[start:start + 5000])
+
+    insert(NotificationModel, [{
+        "notification_id": uuid.uuid4(), "user_id": users_id, "notifications_message": "status changed",
+        "notification_created_at": now - timedelta(minutes=i), "notification_is_read": True,
+    } for i in range(notifications)])
+    insert(ComplaintModel, [{
+        "complaint_id": uuid.uuid4(), "sender_id": users_id, "complaint_type": ComplaintType.IT,
+        "complaint_dep": ComplaintDep.public, "complaint_status": ComplaintStatus.done,
+        "complaint_title": "wifi", "complaint_message": "wifi down again", "complaint_created_at": now,
+    } for _ in range(complaints)])
+    insert(SuggestionModel, [{
+        "suggestion_id": uuid.uuid4(), "users_id": users_id, "suggestion_message": "more printers",
+    } for _ in range(max(1, complaints // 10))])
+    session_ids = [uuid.uuid4() for _ in range(sessions)]
+    insert(ChatSessionModel, [{"sessions_id": s, "users_id": users_id, "session_title": "help"}
+                              for s in session_ids])
+    insert(ChatMessageModel, [{
+        "chat_id": uuid.uuid4(), "session_id": s, "sender": SenderType.user if i % 2 else SenderType.bot,
+        "message": "my grade is missing", "created_at": now + timedelta(seconds=i),
+    } for s in session_ids for i in range(messages)])
+    db.session.commit()
+    return users_id
+
+
+def orm_cascade(db, models, users_id, batch_size):
+    """What delete_student used to cost: every child loaded into the session and deleted row by row."""
+    UserModel, ComplaintModel, NotificationModel, SuggestionModel, ChatSessionModel, ChatMessageModel = models[:6]
+    user = db.session.get(UserModel, users_id)
+    for chat_session in ChatSessionModel.query.filter_by(users_id=users_id):
+        for message in ChatMessageModel.query.filter_by(session_id=chat_session.sessions_id):
+            db.session.delete(message)
+        db.session.delete(chat_session)
+    for model, column in ((NotificationModel, NotificationModel.user_id), (SuggestionModel, SuggestionModel.users_id),
+                          (ComplaintModel, ComplaintModel.sender_id)):
+        for row in model.query.filter(column == users_id):
+            db.session.delete(row)
+    db.session.delete(user)
+    db.session.commit()
+
+
+def db_cascade(db, models, users_id, batch_size):
+    """One DELETE of the user row; ON DELETE CASCADE removes everything in a single transaction."""
+    UserModel = models[0]
+    db.session.execute(db.delete(UserModel).where(UserModel.users_id == users_id))
+    db.session.commit()
+
+
+def batched_purge(db, models, users_id, batch_size):
+    from api import purge_user
+    purge_user(users_id, batch_size)
+
+
+STRATEGIES = {
+    "orm_cascade": orm_cascade,
+    "db_cascade": db_cascade,
+    "batched_purge": batched_purge,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sqlite", metavar="PATH", help="run against a fresh SQLite file instead of DATABASE_URL")
+    parser.add_argument("--notifications", type=int, default=20000)
+    parser.add_argument("--complaints", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=100, help="messages per chat session")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--strategies", nargs="*", choices=sorted(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    from benchmarks import sqlite_compat
+    if args.sqlite or not os.environ.get("DATABASE_URL"):
+        sqlite_compat.use_sqlite(args.sqlite or os.path.join(tempfile.gettempdir(), "complaints_bench_delete.sqlite"))
+
+    from api import (app, db, instrumentation, UserModel, ComplaintModel, NotificationModel, SuggestionModel,
+                     ChatSessionModel, ChatMessageModel, UserRole, ComplaintType, ComplaintDep, ComplaintStatus,
+                     SenderType)
+    models = (UserModel, ComplaintModel, NotificationModel, SuggestionModel, ChatSessionModel, ChatMessageModel,
+              UserRole, ComplaintType, ComplaintDep, ComplaintStatus, SenderType)
+
+    history = {"notifications": args.notifications, "complaints": args.complaints, "chat_sessions": args.sessions,
+               "chat_messages": args.sessions * args.messages}
+    results = {}
+    with app.app_context():
+        sqlite_compat.create_schema(db)
+        for name in args.strategies:
+            timings, peaks, statements = [], [], []
+            for _ in range(args.repeat):
+                users_id = create_history(db, models, args.notifications, args.complaints, args.sessions,
+                                          args.messages)
+                db.session.remove()
+                tracemalloc.start()
+                with instrumentation.count_queries() as recorder:
+                    start = time.perf_counter()
+                    STRATEGIES[name](db, models, users_id, args.batch_size)
+                    timings.append((time.perf_counter() - start) * 1000)
+                peaks.append(tracemalloc.get_traced_memory()[1] / 1024 / 1024)
+                tracemalloc.stop()
+                statements.append(recorder.count)
+                db.session.remove()
+                if db.session.get(UserModel, users_id) is not None:
+                    raise RuntimeError(f"{name} left the user behind")
+            results[name] = {
+                "median_ms": statistics.median(timings),
+                "max_ms": max(timings),
+                "peak_python_mb": max(peaks),
+                "statements": max(statements),
+            }
+
+    if args.json:
+        print(json.dumps({"history": history, "batch_size": args.batch_size, "results": results}, indent=2))
+        return
+
+    print("history: " + ", ".join(f"{n} {k}" for k, n in history.items()))
+    print(f"{'strategy':16} {'median':>10} {'max':>10} {'peak mem':>10} {'statements':>11}")
+    for name, r in results.items():
+        print(f"{name:16} {r['median_ms']:>8.1f}ms {r['max_ms']:>8.1f}ms {r['peak_python_mb']:>8.1f}MB "
+              f"{r['statements']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure login password checks per second across hashing pool sizes.
+
+Simulates a burst of concurrent logins (one thread per request, like the
+threaded Flask server) verifying passwords through PasswordHasher.
+
+    python -m benchmarks.bench_hashing --pool-sizes 0 1 2 4 8 --logins 200 --concurrency 32
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from hashing import PasswordHasher, HashingOverloaded
+
+
+def run(pool_size, logins, concurrency, method):
+    hasher = PasswordHasher(pool_size=pool_size, max_pending=max(1, pool_size) * 8, method=method)
+    stored = hasher.hash("correct horse battery staple")
+    hasher.verify(stored, "warm up the pool")
+
+    latencies = []
+    rejected = 0
+
+    def login(_):
+        nonlocal rejected
+        start = time.perf_counter()
+        try:
+            hasher.verify(stored, "correct horse battery staple")
+        except HashingOverloaded:
+            rejected += 1
+            return
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        list(threads.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    hasher.shutdown()
+
+    latencies.sort()
+    return {
+        "pool_size": pool_size,
+        "logins_per_sec": len(latencies) / elapsed,
+        "rejected_503": rejected,
+        "median_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000 if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[0, 1, 2, os.cpu_count() or 1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--method", default="scrypt:32768:8:1")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = [run(size, args.logins, args.concurrency, args.method) for size in args.pool_sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'pool':>5} {'logins/s':>10} {'median':>10} {'p99':>10} {'503s':>6}")
+    for r in results:
+        print(f"{r['pool_size']:>5} {r['logins_per_sec']:>10.1f} {r['median_ms'] or 0:>8.1f}ms "
+              f"{r['p99_ms'] or 0:>8.1f}ms {r['rejected_503']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Compare per-endpoint query plans and latency with and without the filter indexes.
+
+Seeds N complaints, then runs the query behind each endpoint twice: once with
+the indexes from migrations 8e4b6a1f0c27/b5f09d3e6a18 dropped (inside a
+transaction that is rolled back) and once with them in place.
+
+    DATABASE_URL=postgresql://.../complaint_bench python -m benchmarks.bench_indexes --complaints 100000
+"""
+import argparse
+import json
+import statistics
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from api import app, db, UserModel, ComplaintModel, NotificationModel, UserRole, ComplaintStatus
+from benchmarks.seed import seed
+
+INDEXES = (
+    "ix_complaints_sender_created",
+    "ix_complaints_status_created",
+    "ix_complaints_created_id",
+    "ix_complaints_responder_id",
+    "ix_users_role_name",
+    "ix_notifications_user_unread",
+)
+
+
+def endpoint_queries(sample):
+    """The statement each endpoint issues, with realistic parameters."""
+    return {
+        "login / get_student_by_email": select(UserModel).where(UserModel.users_email == sample["email"]),
+        "get_complaints": select(ComplaintModel)
+            .where(ComplaintModel.sender_id == sample["student_id"])
+            .order_by(ComplaintModel.complaint_created_at.desc()),
+        "get_all_complaints": select(ComplaintModel)
+            .order_by(ComplaintModel.complaint_created_at.desc(), ComplaintModel.complaint_id.desc())
+            .limit(51),
+        "get_all_complaints?status=": select(ComplaintModel)
+            .where(ComplaintModel.complaint_status == ComplaintStatus.under_review)
+            .order_by(ComplaintModel.complaint_created_at.desc(), ComplaintModel.complaint_id.desc())
+            .limit(51),
+        "complaints by responder": select(ComplaintModel)
+            .where(ComplaintModel.responder_id == sample["admin_id"]),
+        "get_all_students": select(UserModel)
+            .where(UserModel.users_role == UserRole.student)
+            .order_by(UserModel.users_name)
+            .limit(100),
+        "unread notifications": select(NotificationModel)
+            .where(NotificationModel.user_id == sample["student_id"],
+                   NotificationModel.notification_is_read == False)  # noqa: E712 - must match the partial index predicate
+            .order_by(NotificationModel.notification_created_at.desc()),
+    }
+
+
+def measure(conn, statement, repeat):
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    plan = conn.execute(text("EXPLAIN (ANALYZE, FORMAT JSON) " + sql)).scalar()[0]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(text(sql)).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "plan": plan["Plan"]["Node Type"] + (f" on {plan['Plan']['Index Name']}" if "Index Name" in plan["Plan"] else ""),
+        "plan_ms": plan["Execution Time"],
+        "median_ms": statistics.median(timings),
+        "p95_ms": sorted(timings)[max(0, int(len(timings) * 0.95) - 1)],
+    }
+
+
+def run(sample, repeat):
+    results = {}
+    with db.engine.connect() as conn:
+        trans = conn.begin()
+        for name in INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        results["before"] = {endpoint: measure(conn, statement, repeat)
+                             for endpoint, statement in endpoint_queries(sample).items()}
+        trans.rollback()  # brings the indexes back
+
+        results["after"] = {endpoint: measure(conn, statement, repeat)
+                            for endpoint, statement in endpoint_queries(sample).items()}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--complaints", type=int, default=100000)
+    parser.add_argument("--notifications", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--no-seed", action="store_true", help="reuse rows already in the database")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    with app.app_context():
+        if not args.no_seed:
+            seed(users=args.users, complaints=args.complaints, notifications=args.notifications)
+        with db.engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+        sample = {
+            "email": db.session.scalar(select(UserModel.users_email).where(UserModel.users_role == UserRole.student).limit(1)),
+            "student_id": db.session.scalar(select(ComplaintModel.sender_id).limit(1)),
+            "admin_id": db.session.scalar(select(ComplaintModel.responder_id).where(ComplaintModel.responder_id.isnot(None)).limit(1)),
+        }
+        results = run(sample, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'endpoint':32} {'before':>10} {'after':>10}  plan before -> after")
+    for endpoint, before in results["before"].items():
+        after = results["after"][endpoint]
+        print(f"{endpoint:32} {before['median_ms']:>8.2f}ms {after['median_ms']:>8.2f}ms  "
+              f"{before['plan']} -> {after['plan']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,559 @@
+"""Latency/throughput benchmark for every API route, through the Flask test client and over HTTP.
+
+Seeds a database, then times each route in turn and writes machine-readable
+results that can be compared across commits. Without DATABASE_URL (or with
+--sqlite) it runs offline against a schema-compatible SQLite file.
+
+    python -m benchmarks.bench_routes --sqlite /tmp/bench.sqlite --output before.json
+    python -m benchmarks.bench_routes --sqlite /tmp/bench.sqlite --baseline before.json
+    DATABASE_URL=postgresql://.../complaint_bench python -m benchmarks.bench_routes \\
+        --transport both --concurrency 8 --output pg.json
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A benchmarked request. path/body/headers are callables of (fixtures, i), so write
+# routes can use a fresh email or complaint on every iteration; setup(fixtures, n)
+# prepares whatever n iterations will consume. weight scales the request count down
+# for routes that are expensive by design (exports, password hashing).
+RouteCase = namedtuple("RouteCase", ["name", "method", "rule", "path", "body", "headers", "setup", "weight", "skip"])
+
+
+def case(name, method, rule, path=None, body=None, headers=None, setup=None, weight=1.0, skip=None):
+    return RouteCase(name, method, rule, path or (lambda fx, i: rule), body, headers, setup, weight, skip)
+
+
+def _json(data):
+    return "application/json", json.dumps(data).encode()
+
+
+def _bearer(fx, i):
+    return {"Authorization": f"Bearer {fx['token']}"}
+
+
+def route_cases(postgres):
+    """One or more cases per route in api.py, in the order they appear there."""
+    pg_only = None if postgres else "needs Postgres"
+    return [
+        case("index", "GET", "/"),
+        case("users list", "GET", "/api/addusers/", weight=0.2),
+        case("users create", "POST", "/api/addusers/", weight=0.1,
+             body=lambda fx, i: _json({"name": f"user {i}", "email": f"resource{i}.{fx['run']}@bench.edu",
+                                       "password": "password", "role": "student"})),
+        case("login", "POST", "/api/login", weight=0.1,
+             body=lambda fx, i: _json({"email": fx["student_email"], "password": "password"})),
+        case("logout", "POST", "/api/logout", setup=setup_logout_tokens,
+             headers=lambda fx, i: {"Authorization": f"Bearer {fx['logout_tokens'][i]}"}),
+        case("student by email", "GET", "/api/student/<email>",
+             path=lambda fx, i: f"/api/student/{fx['student_email']}"),
+        case("student complaints", "GET", "/api/student/showcomplaints",
+             path=lambda fx, i: f"/api/student/showcomplaints?student_email={fx['student_email']}"),
+        case("student complaints (304)", "GET", "/api/student/showcomplaints", setup=setup_complaints_etag,
+             path=lambda fx, i: f"/api/student/showcomplaints?student_email={fx['student_email']}",
+             headers=lambda fx, i: {"If-None-Match": fx["complaints_etag"]}),
+        case("add complaint", "POST", "/api/student/addcomplaint",
+             body=lambda fx, i: _json({"student_email": fx["bench_student_email"], "complaint_title": f"bench {i}",
+                                       "complaint_message": "wifi down in the library", "complaint_type": "IT",
+                                       "complaint_dep": "public"})),
+        case("admin name", "GET", "/api/get_admin_name/<admin_email>",
+             path=lambda fx, i: f"/api/get_admin_name/{fx['admin_email']}"),
+        case("all students", "GET", "/api/admin/get_all_students", weight=0.5),
+        case("add student", "POST", "/api/admin/add_student", weight=0.1,
+             body=lambda fx, i: _json({"users_name": f"added {i}", "users_email": f"added{i}.{fx['run']}@bench.edu",
+                                       "users_password": "password"})),
+        case("update student", "PUT", "/api/admin/update_student",
+             body=lambda fx, i: _json({"old_email": fx["bench_student_email"], "new_name": f"renamed {i}"})),
+        case("delete student", "DELETE", "/api/admin_delete_student", setup=setup_delete_victims,
+             body=lambda fx, i: _json({"email": fx["victims"][i]})),
+        case("bulk delete students", "POST", "/api/admin/students/bulk_delete", setup=setup_bulk_delete_victims,
+             body=lambda fx, i: _json({"emails": fx["bulk_victims"][i]})),
+        case("bulk import students", "POST", "/api/admin/students/bulk", weight=0.05,
+             body=lambda fx, i: ("application/x-ndjson", "".join(
+                 json.dumps({"users_name": f"bulk {i}.{n}", "users_email": f"bulk{i}.{n}.{fx['run']}@bench.edu",
+                             "users_password": "password"}) + "\n" for n in range(20)).encode())),
+        case("export students", "GET", "/api/admin/students/export", weight=0.1),
+        case("complaints page", "GET", "/api/admin/get_all_complaints",
+             path=lambda fx, i: "/api/admin/get_all_complaints?limit=50"),
+        case("complaints page (filtered)", "GET", "/api/admin/get_all_complaints",
+             path=lambda fx, i: "/api/admin/get_all_complaints?limit=50&status=under_review&type=IT"),
+        case("complaints page (cursor)", "GET", "/api/admin/get_all_complaints", setup=setup_complaints_cursor,
+             path=lambda fx, i: f"/api/admin/get_all_complaints?limit=50&cursor={fx['complaints_cursor']}"),
+        case("complaints page (with archive)", "GET", "/api/admin/get_all_complaints",
+             path=lambda fx, i: "/api/admin/get_all_complaints?limit=50&include_archive=true"),
+        case("export complaints", "GET", "/api/admin/complaints/export", weight=0.05,
+             path=lambda fx, i: "/api/admin/complaints/export?format=ndjson"),
+        case("complaint detail", "GET", "/api/admin/get_complaint",
+             path=lambda fx, i: f"/api/admin/get_complaint?id={fx['complaint_ids'][i % len(fx['complaint_ids'])]}"),
+        case("complaint clusters", "GET", "/api/admin/complaints/clusters",
+             path=lambda fx, i: "/api/admin/complaints/clusters?limit=50"),
+        case("complaint duplicates", "GET", "/api/admin/complaints/<uuid:complaint_id>/duplicates",
+             path=lambda fx, i: f"/api/admin/complaints/{fx['complaint_ids'][i % len(fx['complaint_ids'])]}/duplicates"),
+        case("notification stream", "GET", "/api/notifications/stream",
+             skip="long-lived SSE stream; see benchmarks.loadtest for connection-level tests"),
+        case("mark notifications read", "POST", "/api/notifications/mark_read",
+             path=lambda fx, i: f"/api/notifications/mark_read?student_email={fx['student_email']}",
+             body=lambda fx, i: _json({"all": True})),
+        case("update status", "POST", "/api/admin/update_status",
+             body=lambda fx, i: _json({"complaint_id": str(fx["complaint_ids"][i % len(fx["complaint_ids"])]),
+                                       "new_status": ("under_review", "in_progress")[i % 2]})),
+        case("respond", "POST", "/api/admin/respond", setup=setup_unanswered,
+             body=lambda fx, i: _json({"complaint_id": str(fx["unanswered"][i]), "response_message": "fixed",
+                                       "admin_id": str(fx["admin_id"])})),
+        case("bulk update status", "POST", "/api/admin/complaints/bulk", weight=0.2,
+             body=lambda fx, i: _json({"complaint_ids": [str(c) for c in fx["complaint_ids"]],
+                                       "new_status": ("under_review", "in_progress")[i % 2]})),
+        case("upload complaint attachment", "POST", "/api/complaints/<uuid:complaint_id>/attachments",
+             path=lambda fx, i: f"/api/complaints/{fx['complaint_ids'][0]}/attachments?filename=bench{i}.bin",
+             body=lambda fx, i: ("application/octet-stream", i.to_bytes(8, "big") * 2048)),
+        case("upload suggestion attachment", "POST", "/api/suggestions/<uuid:suggestion_id>/attachments",
+             setup=setup_suggestion,
+             path=lambda fx, i: f"/api/suggestions/{fx['suggestion_id']}/attachments?filename=bench{i}.bin",
+             body=lambda fx, i: ("application/octet-stream", i.to_bytes(8, "big") * 2048)),
+        case("list attachments", "GET", "/api/complaints/<uuid:complaint_id>/attachments",
+             path=lambda fx, i: f"/api/complaints/{fx['complaint_ids'][0]}/attachments"),
+        case("download attachment", "GET", "/api/attachments/<uuid:attachment_id>", setup=setup_attachment,
+             path=lambda fx, i: f"/api/attachments/{fx['attachment_id']}"),
+        case("search complaints", "GET", "/api/admin/complaints/search", skip=pg_only,
+             path=lambda fx, i: "/api/admin/complaints/search?q=wifi+library"),
+        case("search suggestions", "GET", "/api/admin/suggestions/search", skip=pg_only,
+             path=lambda fx, i: "/api/admin/suggestions/search?q=wifi"),
+        case("create chat session", "POST", "/api/chat/sessions", headers=_bearer,
+             body=lambda fx, i: _json({"session_title": f"bench {i}"})),
+        case("list chat sessions", "GET", "/api/chat/sessions", headers=_bearer),
+        case("close chat session", "POST", "/api/chat/sessions/<uuid:session_id>/close", setup=setup_chat_sessions,
+             headers=_bearer, path=lambda fx, i: f"/api/chat/sessions/{fx['open_sessions'][i]}/close"),
+        case("post chat message", "POST", "/api/chat/sessions/<uuid:session_id>/messages", headers=_bearer,
+             setup=setup_chat_session, path=lambda fx, i: f"/api/chat/sessions/{fx['chat_session_id']}/messages",
+             body=lambda fx, i: _json({"message": f"my exam grade is missing ({i})"})),
+        case("chat history", "GET", "/api/chat/sessions/<uuid:session_id>/messages", headers=_bearer,
+             setup=setup_chat_session,
+             path=lambda fx, i: f"/api/chat/sessions/{fx['chat_session_id']}/messages?limit=50"),
+        case("admin stats", "GET", "/api/admin/stats", skip=pg_only),
+        case("student stats", "GET", "/api/student/stats",
+             path=lambda fx, i: f"/api/student/stats?student_email={fx['student_email']}"),
+        case("cache stats", "GET", "/api/admin/cache_stats"),
+        case("admin id", "GET", "/api/get_admin_id",
+             path=lambda fx, i: f"/api/get_admin_id?admin_email={fx['admin_email']}"),
+        case("metrics", "GET", "/metrics"),
+    ]
+
+
+# Fixtures: rows picked from the seeded data, plus per-case setup for routes that consume rows
+def load_fixtures(run):
+    from api import db, token_service, UserModel, ComplaintModel, UserRole
+
+    student = db.session.query(UserModel.users_id, UserModel.users_email) \
+        .join(ComplaintModel, ComplaintModel.sender_id == UserModel.users_id) \
+        .filter(UserModel.users_role == UserRole.student) \
+        .group_by(UserModel.users_id, UserModel.users_email) \
+        .order_by(db.func.count().desc()).first()
+    admin = db.session.query(UserModel.users_id, UserModel.users_email) \
+        .filter(UserModel.users_role == UserRole.admin).first()
+    complaint_ids = [c for (c,) in db.session.query(ComplaintModel.complaint_id)
+                     .order_by(ComplaintModel.complaint_created_at.desc()).limit(200)]
+
+    # a dedicated student for routes that modify the caller, so they don't skew the read fixtures
+    bench_student = UserModel(users_name="bench student", users_email=f"bench.{run}@bench.edu",
+                              users_password=student_password_hash(), users_role=UserRole.student)
+    db.session.add(bench_student)
+    db.session.commit()
+
+    return {
+        "run": run,
+        "student_id": student.users_id,
+        "student_email": student.users_email,
+        "admin_id": admin.users_id,
+        "admin_email": admin.users_email,
+        "complaint_ids": complaint_ids,
+        "bench_student_email": bench_student.users_email,
+        "token": token_service.issue(bench_student.users_id, UserRole.student.name, bench_student.users_email),
+    }
+
+
+def student_password_hash():
+    from werkzeug.security import generate_password_hash
+    return generate_password_hash("password")
+
+
+def setup_logout_tokens(fx, n, client):
+    from api import token_service, UserRole
+    fx["logout_tokens"] = [token_service.issue(fx["student_id"], UserRole.student.name, fx["student_email"])
+                           for _ in range(n)]
+
+
+def setup_complaints_etag(fx, n, client):
+    response = client.get(f"/api/student/showcomplaints?student_email={fx['student_email']}")
+    fx["complaints_etag"] = response.headers["ETag"]
+
+
+def setup_complaints_cursor(fx, n, client):
+    first = client.get("/api/admin/get_all_complaints?limit=50").get_json()
+    fx["complaints_cursor"] = first["next_cursor"]
+    second = client.get(f"/api/admin/get_all_complaints?limit=50&cursor={first['next_cursor']}").get_json()
+    repeated = {c["complaint_id"] for c in first["complaints"]} & {c["complaint_id"] for c in second["complaints"]}
+    if repeated:
+        raise RuntimeError(f"cursor page repeats {len(repeated)} complaints from the page before it")
+
+
+def insert_victims(fx, count):
+    from api import db, UserModel, UserRole
+    password = student_password_hash()
+    emails = [f"victim{i}.{fx['run']}.{uuid.uuid4().hex[:6]}@bench.edu" for i in range(count)]
+    db.session.execute(db.insert(UserModel), [{"users_id": uuid.uuid4(), "users_name": "victim", "users_email": e,
+                                               "users_password": password, "users_role": UserRole.student}
+                                              for e in emails])
+    db.session.commit()
+    return emails
+
+
+def setup_delete_victims(fx, n, client):
+    fx["victims"] = insert_victims(fx, n)
+
+
+BULK_DELETE_SIZE = 10
+
+
+def setup_bulk_delete_victims(fx, n, client):
+    emails = insert_victims(fx, n * BULK_DELETE_SIZE)
+    fx["bulk_victims"] = [emails[i:i + BULK_DELETE_SIZE] for i in range(0, len(emails), BULK_DELETE_SIZE)]
+
+
+def setup_unanswered(fx, n, client):
+    from api import db, ComplaintModel, ComplaintType, ComplaintDep, ComplaintStatus
+    fx["unanswered"] = [uuid.uuid4() for _ in range(n)]
+    db.session.execute(db.insert(ComplaintModel), [{
+        "complaint_id": complaint_id, "sender_id": fx["student_id"], "complaint_title": "awaiting response",
+        "complaint_message": "please respond", "complaint_type": ComplaintType.IT,
+        "complaint_dep": ComplaintDep.public, "complaint_status": ComplaintStatus.under_checking,
+        "complaint_created_at": datetime.now(timezone.utc),
+    } for complaint_id in fx["unanswered"]])
+    db.session.commit()
+
+
+def setup_suggestion(fx, n, client):
+    from api import db, SuggestionModel
+    suggestion = SuggestionModel(users_id=fx["student_id"], suggestion_title="bench",
+                                 suggestion_message="longer library hours")
+    db.session.add(suggestion)
+    db.session.commit()
+    fx["suggestion_id"] = suggestion.suggestion_id
+
+
+def setup_attachment(fx, n, client):
+    response = client.post(f"/api/complaints/{fx['complaint_ids'][0]}/attachments?filename=fixture.bin",
+                           data=os.urandom(256 * 1024), content_type="application/octet-stream")
+    fx["attachment_id"] = response.get_json()["attachment"]["attachment_id"]
+
+
+def setup_chat_sessions(fx, n, client):
+    fx["open_sessions"] = [client.post("/api/chat/sessions", json={"session_title": f"to close {i}"},
+                                       headers=_bearer(fx, i)).get_json()["session"]["session_id"]
+                           for i in range(n)]
+
+
+def setup_chat_session(fx, n, client):
+    if "chat_session_id" not in fx:
+        response = client.post("/api/chat/sessions", json={"session_title": "bench history"}, headers=_bearer(fx, 0))
+        fx["chat_session_id"] = response.get_json()["session"]["session_id"]
+        for i in range(60):
+            client.post(f"/api/chat/sessions/{fx['chat_session_id']}/messages",
+                        json={"message": f"warm up {i}"}, headers=_bearer(fx, 0))
+
+
+# Transports
+def request_args(route_case, fx, i):
+    headers = dict(route_case.headers(fx, i)) if route_case.headers else {}
+    body = None
+    if route_case.body:
+        content_type, body = route_case.body(fx, i)
+        headers["Content-Type"] = content_type
+    return route_case.path(fx, i), headers, body
+
+
+class TestClientTransport:
+    name = "client"
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def run(self, route_case, fx, n, concurrency):
+        latencies, statuses = [], {}
+        started = time.perf_counter()
+        for i in range(n):
+            path, headers, body = request_args(route_case, fx, i)
+            t0 = time.perf_counter()
+            response = self.client.open(path, method=route_case.method, headers=headers, data=body)
+            response.get_data()  # streamed bodies are produced here
+            response.close()
+            latencies.append(time.perf_counter() - t0)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        return latencies, statuses, time.perf_counter() - started
+
+    def close(self):
+        pass
+
+
+class HTTPTransport:
+    """Serves the app from a threaded WSGI server in this process and calls it over keep-alive sockets."""
+
+    name = "http"
+
+    def __init__(self, app):
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        self.server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def run(self, route_case, fx, n, concurrency):
+        latencies, statuses = [], {}
+        lock = threading.Lock()
+        counter = itertools.count()
+
+        def worker():
+            conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+            local, local_statuses = [], {}
+            while (i := next(counter)) < n:
+                path, headers, body = request_args(route_case, fx, i)
+                t0 = time.perf_counter()
+                try:
+                    conn.request(route_case.method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    status = response.status
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+                    status = "error"
+                local.append(time.perf_counter() - t0)
+                local_statuses[status] = local_statuses.get(status, 0) + 1
+            conn.close()
+            with lock:
+                latencies.extend(local)
+                for status, count in local_statuses.items():
+                    statuses[status] = statuses.get(status, 0) + count
+
+        threads = [threading.Thread(target=worker) for _ in range(max(1, concurrency))]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return latencies, statuses, time.perf_counter() - started
+
+    def close(self):
+        self.server.shutdown()
+
+
+def summarize(route_case, transport, latencies, statuses, elapsed):
+    latencies = sorted(latencies)
+    ms = [v * 1000 for v in latencies]
+
+    def pct(p):
+        return ms[min(len(ms) - 1, int(len(ms) * p))]
+
+    errors = sum(count for status, count in statuses.items() if status == "error" or status >= 500)
+    return {
+        "route": route_case.name,
+        "method": route_case.method,
+        "rule": route_case.rule,
+        "transport": transport,
+        "requests": len(ms),
+        "errors": errors,
+        "status_codes": {str(k): v for k, v in sorted(statuses.items(), key=lambda kv: str(kv[0]))},
+        "requests_per_sec": len(ms) / elapsed if elapsed else None,
+        "mean_ms": statistics.fmean(ms),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": ms[-1],
+    }
+
+
+def uncovered_rules(app, cases):
+    covered = {(c.rule, c.method) for c in cases}
+    missing = []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == "static":
+            continue
+        for method in sorted(rule.methods - {"HEAD", "OPTIONS"}):
+            if (rule.rule, method) not in covered:
+                missing.append(f"{method} {rule.rule}")
+    return missing
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def compare(results, baseline):
+    """Print p50/p95 changes against an earlier results file."""
+    before = {(r["route"], r["transport"]): r for r in baseline["results"] if "p50_ms" in r}
+    print(f"\nvs baseline {baseline['meta'].get('commit') or '?'}")
+    print(f"{'route':<32} {'transport':<9} {'p50':>9} {'change':>8} {'p95':>9} {'change':>8}")
+    for r in results:
+        old = before.get((r["route"], r["transport"]))
+        if "p50_ms" not in r or old is None:
+            continue
+        print(f"{r['route']:<32} {r['transport']:<9} {r['p50_ms']:>7.2f}ms {_change(r['p50_ms'], old['p50_ms']):>8} "
+              f"{r['p95_ms']:>7.2f}ms {_change(r['p95_ms'], old['p95_ms']):>8}")
+
+
+def _change(new, old):
+    return f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sqlite", metavar="PATH", help="run against a fresh SQLite file instead of DATABASE_URL")
+    parser.add_argument("--transport", choices=("client", "http", "both"), default="client")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route (scaled down for heavy routes)")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel connections for the http transport")
+    parser.add_argument("--routes", nargs="*", help="only run cases whose name contains one of these")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--admins", type=int, default=10)
+    parser.add_argument("--complaints", type=int, default=20000)
+    parser.add_argument("--notifications", type=int, default=20000)
+    parser.add_argument("--file-ratio", type=float, default=0.1)
+    parser.add_argument("--file-size", type=int, default=64 * 1024)
+    parser.add_argument("--chat-sessions", type=int, default=2000)
+    parser.add_argument("--chat-messages", type=int, default=20000)
+    parser.add_argument("--archive-after-days", type=int, default=None,
+                        help="after seeding, archive done complaints older than this (hot/archive split)")
+    parser.add_argument("--no-seed", action="store_true", help="reuse rows already in the database")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="compare against an earlier --output file")
+    args = parser.parse_args()
+
+    # both must happen before api is imported: the app reads its settings at import time
+    from benchmarks import sqlite_compat
+    if args.sqlite or not os.environ.get("DATABASE_URL"):
+        sqlite_compat.use_sqlite(args.sqlite or os.path.join(tempfile.gettempdir(), "complaints_bench.sqlite"),
+                                 fresh=not args.no_seed)
+    os.environ.setdefault("ATTACHMENT_DIR", tempfile.mkdtemp(prefix="bench-attachments-"))
+    os.environ.setdefault("SLOW_QUERY_MS", "0")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")  # every request comes from one client
+
+    from api import app, db
+    from benchmarks.seed import seed
+
+    run = uuid.uuid4().hex[:8]
+    with app.app_context():
+        sqlite_compat.create_schema(db)
+        postgres = not sqlite_compat.is_sqlite(db)
+        scale = {k: getattr(args, k) for k in ("users", "admins", "complaints", "notifications", "file_ratio",
+                                               "file_size", "chat_sessions", "chat_messages",
+                                               "archive_after_days")}
+        if not args.no_seed:
+            t0 = time.perf_counter()
+            seed(args.users, args.admins, args.complaints, args.notifications, file_ratio=args.file_ratio,
+                 file_size=args.file_size, chat_sessions=args.chat_sessions, chat_messages=args.chat_messages)
+            print(f"seeded in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+            t0 = time.perf_counter()
+            from api import rebuild_duplicate_index
+            rebuild_duplicate_index()
+            print(f"duplicate index built in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+            if args.archive_after_days is not None:
+                from api import archive_complaints
+                print(f"archived {archive_complaints(args.archive_after_days)} complaints", file=sys.stderr)
+        fx = load_fixtures(run)
+        dialect = db.engine.dialect.name
+
+    cases = route_cases(postgres)
+    missing = uncovered_rules(app, cases)
+    if missing:
+        print("routes without a benchmark case: " + ", ".join(missing), file=sys.stderr)
+    if args.routes:
+        cases = [c for c in cases if any(r in c.name for r in args.routes)]
+
+    transports = ("client", "http") if args.transport == "both" else (args.transport,)
+    results = []
+    setup_client = app.test_client()
+    for transport_name in transports:
+        fx["run"] = f"{run}{transport_name}"  # fresh emails for each pass over the write routes
+        transport = TestClientTransport(app) if transport_name == "client" else HTTPTransport(app)
+        try:
+            for route_case in cases:
+                if route_case.skip:
+                    results.append({"route": route_case.name, "method": route_case.method, "rule": route_case.rule,
+                                    "transport": transport_name, "skipped": route_case.skip})
+                    continue
+                n = max(5, int(args.requests * route_case.weight))
+                warmup = min(args.warmup, n)
+                with app.app_context():
+                    if route_case.setup:
+                        route_case.setup(fx, warmup + n, setup_client)
+                # warm-up iterations use the first slots of any per-iteration fixtures
+                transport.run(route_case, fx, warmup, args.concurrency)
+                shifted = route_case._replace(
+                    path=_shifted(route_case.path, warmup),
+                    body=route_case.body and _shifted(route_case.body, warmup),
+                    headers=route_case.headers and _shifted(route_case.headers, warmup))
+                latencies, statuses, elapsed = transport.run(shifted, fx, n, args.concurrency)
+                result = summarize(route_case, transport_name, latencies, statuses, elapsed)
+                results.append(result)
+                print(f"{transport_name:<6} {route_case.name:<32} {result['p50_ms']:>8.2f}ms p50 "
+                      f"{result['p95_ms']:>8.2f}ms p95 {result['requests_per_sec']:>8.1f} req/s "
+                      f"{result['errors']:>3} errors", file=sys.stderr)
+        finally:
+            transport.close()
+
+    commit, dirty = git_revision()
+    report = {
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "database": dialect,
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "scale": scale,
+            "uncovered_routes": missing,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+def _shifted(fn, offset):
+    return lambda fx, i: fn(fx, i + offset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare tsvector/GIN full-text search with naive ILIKE scans.
+
+    DATABASE_URL=postgresql://.../complaint_bench python -m benchmarks.bench_search --complaints 100000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from api import app, db, ComplaintModel
+from benchmarks.seed import seed, WORDS
+
+
+def fts_query(terms, limit):
+    tsquery = db.func.websearch_to_tsquery('english', terms)
+    rank = db.func.ts_rank_cd(ComplaintModel.complaint_search, tsquery)
+    return db.session.query(ComplaintModel.complaint_id, rank) \
+        .filter(ComplaintModel.complaint_search.op('@@')(tsquery)) \
+        .order_by(rank.desc()).limit(limit)
+
+
+def ilike_query(terms, limit):
+    filters = []
+    for word in terms.split():
+        pattern = f"%{word}%"
+        filters.append(db.or_(ComplaintModel.complaint_title.ilike(pattern),
+                              ComplaintModel.complaint_message.ilike(pattern)))
+    return db.session.query(ComplaintModel.complaint_id).filter(*filters).limit(limit)
+
+
+def time_queries(build, searches, limit):
+    timings = []
+    for terms in searches:
+        start = time.perf_counter()
+        build(terms, limit).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[max(0, int(len(timings) * 0.95) - 1)],
+        "queries": len(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--complaints", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--no-seed", action="store_true", help="reuse rows already in the database")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    # a rare word plus a common one, the way admins actually search
+    searches = [f"{rng.choice(WORDS)} {rng.choice(WORDS)}" for _ in range(args.queries)]
+
+    with app.app_context():
+        if not args.no_seed:
+            seed(users=1000, complaints=args.complaints, notifications=0)
+            db.session.execute(db.text("ANALYZE complaints"))
+            db.session.commit()
+        total = db.session.query(db.func.count(ComplaintModel.complaint_id)).scalar()
+        results = {
+            "rows": total,
+            "tsvector": time_queries(fts_query, searches, args.limit),
+            "ilike": time_queries(ilike_query, searches, args.limit),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['rows']} complaints, {args.queries} searches, limit {args.limit}")
+    for name in ("tsvector", "ilike"):
+        r = results[name]
+        print(f"{name:>9}: median {r['median_ms']:.2f}ms  p95 {r['p95_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Microbenchmark: rows/sec of the compiled RowSerializer vs. hand-written per-object dicts.
+
+Runs offline on synthetic rows; --db additionally times the full ORM-object path
+against with_entities tuples on the configured database.
+
+    python -m benchmarks.bench_serializer --rows 100000
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from api import app, db, ComplaintModel, ComplaintType, ComplaintDep, ComplaintStatus, complaint_serializer
+
+
+def legacy_to_dict(c):
+    # the per-row code ComplaintModel.to_dict used before the serializer layer
+    return {
+        "complaint_id": str(c.complaint_id),
+        "sender_id": str(c.sender_id) if c.sender_id else None,
+        "complaint_type": c.complaint_type.name if c.complaint_type else None,
+        "complaint_dep": c.complaint_dep.name if c.complaint_dep else None,
+        "complaint_status": c.complaint_status.name if c.complaint_status else None,
+        "complaint_title": c.complaint_title,
+        "complaint_message": c.complaint_message,
+        "complaint_created_at": c.complaint_created_at.isoformat() if c.complaint_created_at else None,
+        "responder_id": str(c.responder_id) if c.responder_id else None,
+        "response_message": c.response_message if c.response_message else None,
+        "response_created_at": c.response_created_at.isoformat() if c.response_created_at else None,
+    }
+
+
+def synthetic_rows(n):
+    rng = random.Random(3)
+    now = datetime.now(timezone.utc)
+    for _ in range(n):
+        yield (uuid.uuid4(), uuid.uuid4(), rng.choice(list(ComplaintType)), rng.choice(list(ComplaintDep)),
+               rng.choice(list(ComplaintStatus)), "printer out of toner", "the lab printer has been empty all week",
+               now - timedelta(minutes=rng.randrange(100000)), None, None, None)
+
+
+def rate(fn, rows):
+    start = time.perf_counter()
+    fn(rows)
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--db", action="store_true", help="also time ORM objects vs tuples against DATABASE_URL")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    rows = list(synthetic_rows(args.rows))
+    keys = complaint_serializer.keys
+    objects = [SimpleNamespace(**dict(zip(keys, row))) for row in rows]
+
+    results = {
+        "legacy_dict_rows_per_sec": rate(lambda rs: [legacy_to_dict(o) for o in rs], objects),
+        "serializer_rows_per_sec": rate(complaint_serializer.dump_many, rows),
+        "serializer_stream_rows_per_sec": rate(lambda rs: "".join(complaint_serializer.stream_array(rs)), rows),
+        "legacy_json_rows_per_sec": rate(lambda rs: json.dumps([legacy_to_dict(o) for o in rs]), objects),
+    }
+
+    if args.db:
+        with app.app_context():
+            limit = args.rows
+            start = time.perf_counter()
+            orm = [legacy_to_dict(c) for c in ComplaintModel.query.limit(limit).all()]
+            results["db_orm_objects_rows_per_sec"] = len(orm) / (time.perf_counter() - start)
+            start = time.perf_counter()
+            tuples = complaint_serializer.dump_many(
+                db.session.query(*complaint_serializer.columns).limit(limit).all())
+            results["db_tuples_rows_per_sec"] = len(tuples) / (time.perf_counter() - start)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, value in results.items():
+        print(f"{name:34} {value:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
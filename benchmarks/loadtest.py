@@ -0,0 +1,149 @@
+"""Load-test the API across worker/pool combinations.
+
+Starts serve.py once per (workers, pool size) combination, hammers a mix of
+read routes over HTTP with keep-alive connections and reports requests/sec and
+latency percentiles. Point DATABASE_URL at a seeded local Postgres
+(python -m benchmarks.seed) first.
+
+    DATABASE_URL=postgresql://.../complaint_bench python -m benchmarks.loadtest \\
+        --workers 1 2 4 --pool-sizes 2 5 10 --requests 5000 --concurrency 32
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sample_paths(database_url):
+    """Request paths that hit real rows in the seeded database."""
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        email = conn.execute(text("SELECT users_email FROM users WHERE users_role = 'student' "
+                                  "AND EXISTS (SELECT 1 FROM complaints WHERE sender_id = users_id) LIMIT 1")).scalar()
+        complaint_id = conn.execute(text("SELECT complaint_id FROM complaints LIMIT 1")).scalar()
+    engine.dispose()
+    return [
+        "/api/admin/get_all_complaints?limit=50",
+        "/api/admin/get_all_complaints?limit=50&status=under_review",
+        f"/api/student/showcomplaints?student_email={email}",
+        f"/api/admin/get_complaint?id={complaint_id}",
+        f"/api/student/{email}",
+        "/api/admin/get_all_students",
+    ]
+
+
+def wait_until_ready(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def hammer(host, port, paths, total, concurrency):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    counter = itertools.count()
+
+    def client():
+        nonlocal errors
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local = []
+        local_errors = 0
+        while (i := next(counter)) < total:
+            start = time.perf_counter()
+            try:
+                conn.request("GET", paths[i % len(paths)])
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+                continue
+            local.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else None
+
+    return {"requests_per_sec": len(latencies) / elapsed, "p50_ms": pct(0.50), "p99_ms": pct(0.99), "errors": errors}
+
+
+def run_combo(workers, pool_size, args, paths):
+    env = dict(os.environ, DB_POOL_SIZE=str(pool_size), DB_MAX_OVERFLOW="0")
+    env.setdefault("RATE_LIMIT_ENABLED", "0")  # one client IP would exhaust its buckets at once
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--bind", f"{args.host}:{args.port}", "--workers", str(workers),
+         "--threads", str(args.threads)],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(args.host, args.port)
+        hammer(args.host, args.port, paths, min(200, args.requests), args.concurrency)  # warm up
+        result = hammer(args.host, args.port, paths, args.requests, args.concurrency)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return {"workers": workers, "pool_size": pool_size, **result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[2, 5, 10])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        parser.error("set DATABASE_URL to a seeded database")
+    paths = sample_paths(database_url)
+
+    results = [run_combo(w, p, args, paths) for w in args.workers for p in args.pool_sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'workers':>7} {'pool':>5} {'req/s':>9} {'p50':>9} {'p99':>9} {'errors':>7}")
+    for r in results:
+        print(f"{r['workers']:>7} {r['pool_size']:>5} {r['requests_per_sec']:>9.1f} "
+              f"{r['p50_ms'] or 0:>7.1f}ms {r['p99_ms'] or 0:>7.1f}ms {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
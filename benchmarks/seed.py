@@ -0,0 +1,159 @@
+"""Seed the configured database with synthetic users, complaints, notifications and chats.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.seed --users 1000 --complaints 50000 \\
+        --file-ratio 0.1 --chat-sessions 2000 --chat-messages 20000
+"""
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from werkzeug.security import generate_password_hash
+
+from api import (app, db, UserModel, ComplaintModel, NotificationModel, ChatSessionModel, ChatMessageModel,
+                 UserRole, ComplaintType, ComplaintDep, ComplaintStatus, SessionStatus, SenderType)
+
+BATCH_SIZE = 5000
+FILE_BATCH_BYTES = 32 * 1024 * 1024  # keep batches carrying complaint_file blobs to a sane size
+WORDS = ("wifi", "exam", "grade", "portal", "library", "schedule", "fees", "lab",
+         "registration", "course", "printer", "login", "email", "room", "club")
+
+
+def _batched(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def seed(users=1000, admins=10, complaints=10000, notifications=10000, seed_value=42,
+         file_ratio=0.0, file_size=64 * 1024, chat_sessions=0, chat_messages=0):
+    """Insert synthetic rows in batches and return the ids that were created.
+
+    file_ratio is the share of complaints that carry a legacy complaint_file
+    blob of file_size bytes; chat_messages are spread over chat_sessions.
+    """
+    rng = random.Random(seed_value)
+    now = datetime.now(timezone.utc)
+    # hashing is deliberately done once; the benchmarks measure queries, not scrypt
+    password = generate_password_hash("password")
+
+    student_ids = [uuid.uuid4() for _ in range(users)]
+    admin_ids = [uuid.uuid4() for _ in range(admins)]
+    run = uuid.uuid4().hex[:8]
+
+    user_rows = [{
+        "users_id": users_id,
+        "users_name": f"student {i}",
+        "users_email": f"student{i}.{run}@example.edu",
+        "users_password": password,
+        "users_role": UserRole.student,
+    } for i, users_id in enumerate(student_ids)]
+    user_rows += [{
+        "users_id": users_id,
+        "users_name": f"admin {i}",
+        "users_email": f"admin{i}.{run}@example.edu",
+        "users_password": password,
+        "users_role": UserRole.admin,
+    } for i, users_id in enumerate(admin_ids)]
+    for batch in _batched(user_rows):
+        db.session.execute(db.insert(UserModel), batch)
+
+    # a few distinct blobs are enough; their size, not their content, is what costs
+    blobs = [rng.randbytes(file_size) for _ in range(4)] if file_ratio > 0 else []
+
+    def complaint_rows():
+        for _ in range(complaints):
+            created_at = now - timedelta(minutes=rng.randrange(0, 60 * 24 * 365 * 2))
+            status = rng.choice(list(ComplaintStatus))
+            responded = status == ComplaintStatus.done
+            yield {
+                "complaint_id": uuid.uuid4(),
+                "sender_id": rng.choice(student_ids),
+                "complaint_type": rng.choice(list(ComplaintType)),
+                "complaint_dep": rng.choice(list(ComplaintDep)),
+                "complaint_status": status,
+                "complaint_title": _sentence(rng, 4),
+                "complaint_message": _sentence(rng, 30),
+                "complaint_created_at": created_at,
+                "responder_id": rng.choice(admin_ids) if responded else None,
+                "response_message": _sentence(rng, 10) if responded else None,
+                "response_created_at": created_at + timedelta(hours=rng.randrange(1, 240)) if responded else None,
+                "complaint_file": rng.choice(blobs) if blobs and rng.random() < file_ratio else None,
+            }
+    batch_size = max(1, min(BATCH_SIZE, FILE_BATCH_BYTES // max(1, int(file_size * file_ratio))))
+    for batch in _batched(complaint_rows(), batch_size):
+        db.session.execute(db.insert(ComplaintModel), batch)
+
+    def notification_rows():
+        for _ in range(notifications):
+            yield {
+                "notification_id": uuid.uuid4(),
+                "user_id": rng.choice(student_ids),
+                "notifications_message": _sentence(rng, 8),
+                "notification_created_at": now - timedelta(minutes=rng.randrange(0, 60 * 24 * 90)),
+                "notification_is_read": rng.random() < 0.8,
+            }
+    for batch in _batched(notification_rows()):
+        db.session.execute(db.insert(NotificationModel), batch)
+
+    session_ids = [uuid.uuid4() for _ in range(chat_sessions)]
+    session_rows = [{
+        "sessions_id": sessions_id,
+        "users_id": rng.choice(student_ids),
+        "session_title": _sentence(rng, 3),
+        "session_status": SessionStatus.open if rng.random() < 0.3 else SessionStatus.close,
+        "session_created_at": now - timedelta(minutes=rng.randrange(0, 60 * 24 * 180)),
+    } for sessions_id in session_ids]
+    for batch in _batched(session_rows):
+        db.session.execute(db.insert(ChatSessionModel), batch)
+
+    def message_rows():
+        if not session_rows:
+            return
+        for i in range(chat_messages):
+            chat_session = rng.choice(session_rows)
+            yield {
+                "chat_id": uuid.uuid4(),
+                "session_id": chat_session["sessions_id"],
+                "sender": SenderType.user if i % 2 == 0 else SenderType.bot,
+                "message": _sentence(rng, 12),
+                "created_at": chat_session["session_created_at"] + timedelta(seconds=rng.randrange(0, 3600)),
+            }
+    for batch in _batched(message_rows()):
+        db.session.execute(db.insert(ChatMessageModel), batch)
+
+    db.session.commit()
+    return {"students": student_ids, "admins": admin_ids, "chat_sessions": session_ids, "run": run}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--admins", type=int, default=10)
+    parser.add_argument("--complaints", type=int, default=10000)
+    parser.add_argument("--notifications", type=int, default=10000)
+    parser.add_argument("--file-ratio", type=float, default=0.0, help="share of complaints with a complaint_file blob")
+    parser.add_argument("--file-size", type=int, default=64 * 1024)
+    parser.add_argument("--chat-sessions", type=int, default=0)
+    parser.add_argument("--chat-messages", type=int, default=0)
+    args = parser.parse_args()
+
+    with app.app_context():
+        seed(args.users, args.admins, args.complaints, args.notifications, file_ratio=args.file_ratio,
+             file_size=args.file_size, chat_sessions=args.chat_sessions, chat_messages=args.chat_messages)
+    print(f"Seeded {args.users} students, {args.admins} admins, "
+          f"{args.complaints} complaints, {args.notifications} notifications, "
+          f"{args.chat_sessions} chat sessions, {args.chat_messages} chat messages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Run the Postgres models on SQLite, so benchmarks can run without a database server.
+
+Postgres-only column types are rendered as their closest SQLite storage type
+and generated tsvector columns become plain nullable columns. now() is
+rendered in the same 'YYYY-MM-DD HH:MM:SS.ffffff' text SQLAlchemy binds
+datetimes as, so server-default timestamps compare correctly against bound
+ones (keyset cursors compare them as strings). Everything that
+needs real Postgres (full-text search, materialized stats views, LISTEN/NOTIFY)
+is reported as skipped by the benchmarks rather than emulated.
+
+Call use_sqlite() before anything imports api, since the app reads
+DATABASE_URL when it is created.
+"""
+import os
+
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import BYTEA, JSONB, TSVECTOR
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.sql import functions
+
+
+@compiles(BYTEA, "sqlite")
+def _bytea(type_, compiler, **kw):
+    return "BLOB"
+
+
+@compiles(TSVECTOR, "sqlite")
+def _tsvector(type_, compiler, **kw):
+    return "TEXT"
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(functions.now, "sqlite")
+def _now(element, compiler, **kw):
+    # CURRENT_TIMESTAMP has whole seconds, which sort before the same second bound with microseconds
+    return "(strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')"
+
+
+@compiles(CreateColumn, "sqlite")
+def _create_column(element, compiler, **kw):
+    column = element.element
+    if column.computed is not None:
+        # to_tsvector() has no SQLite equivalent; keep the column, drop the expression
+        return f"{compiler.preparer.format_column(column)} TEXT"
+    return compiler.visit_create_column(element, **kw)
+
+
+@event.listens_for(Engine, "connect")
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores ON DELETE CASCADE / SET NULL unless asked, and deletes rely on them
+    if type(dbapi_connection).__module__.startswith("sqlite3"):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def use_sqlite(path, fresh=True):
+    """Point the app at a SQLite file; fresh=True starts from an empty database."""
+    path = os.path.abspath(path)
+    if fresh and os.path.exists(path):
+        os.remove(path)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return os.environ["DATABASE_URL"]
+
+
+def is_sqlite(db):
+    return db.engine.dialect.name == "sqlite"
+
+
+def create_schema(db):
+    """Create any missing tables (and, on Postgres, the stats views) for a benchmark database."""
+    from api import create_stats_views
+
+    db.create_all()
+    if not is_sqlite(db):
+        create_stats_views()
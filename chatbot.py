@@ -0,0 +1,32 @@
+import importlib
+
+# keyword -> canned guidance; good enough until a real model is plugged in
+KEYWORD_REPLIES = (
+    (("wifi", "internet", "network", "portal", "login", "password", "email"),
+     "That sounds like an IT issue. You can file it as an IT complaint and the support team will follow up."),
+    (("exam", "grade", "course", "lecture", "schedule", "registration"),
+     "That sounds academic. Filing an Academic complaint routes it to your department."),
+    (("club", "event", "activity", "sports", "trip"),
+     "For student activities, an Activities complaint reaches the activities office."),
+    (("fees", "payment", "card", "certificate", "document"),
+     "Administrative matters like fees and documents go through an Administrative complaint."),
+)
+FALLBACK_REPLY = "Thanks, I've noted that. Could you tell me a bit more so I can point you to the right place?"
+
+
+class KeywordResponder:
+    """Local rule-based bot: answers from keywords in the latest user message."""
+
+    def __call__(self, session_title, recent_messages):
+        text = recent_messages[-1][1].lower() if recent_messages else session_title.lower()
+        for keywords, reply in KEYWORD_REPLIES:
+            if any(word in text for word in keywords):
+                return reply
+        return FALLBACK_REPLY
+
+
+def load_responder(path):
+    """Build a responder from 'module:attribute'; classes are instantiated, functions used as-is."""
+    module_name, _, attribute = path.partition(":")
+    target = getattr(importlib.import_module(module_name), attribute)
+    return target() if isinstance(target, type) else target
@@ -1,4 +1,5 @@
-from api import db, app
+from api import db, app, create_stats_views
 
 with app.app_context():
-    db.create_all()
\ No newline at end of file
+    db.create_all()
+    create_stats_views()
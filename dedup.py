@@ -0,0 +1,106 @@
+"""Near-duplicate detection for short texts with MinHash signatures and LSH banding.
+
+A signature keeps, for each of num_perm hash permutations, the minimum hash
+over the text's word shingles; the share of equal positions in two
+signatures estimates the Jaccard similarity of their shingle sets. The
+signature is cut into bands of rows_per_band values, and texts that agree
+on a whole band land in the same bucket, so candidates are found by a few
+bucket lookups instead of comparing against every stored text.
+
+With the defaults (20 bands of 6 rows) a pair at similarity 0.8 shares a
+bucket with probability ~0.998, and a pair at 0.4 with ~0.08.
+"""
+import hashlib
+import random
+import re
+import struct
+from array import array
+from collections import Counter
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text, size=2):
+    """Lower-cased word n-grams; texts shorter than size fall back to their single words."""
+    words = WORD_RE.findall((text or "").lower())
+    if len(words) < size:
+        return set(words)
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash32(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=4).digest(), "little")
+
+
+class MinHasher:
+    """Signatures and LSH band keys; every index built with one setting must keep using it."""
+
+    def __init__(self, bands=20, rows_per_band=6, seed=1):
+        self.bands = bands
+        self.rows_per_band = rows_per_band
+        self.num_perm = bands * rows_per_band
+        rng = random.Random(seed)
+        self._permutations = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                              for _ in range(self.num_perm)]
+        self._format = f"<{self.num_perm}I"
+
+    def signature(self, text):
+        hashes = [_hash32(s) for s in shingles(text)] or [0]
+        return array("I", [min([(a * h + b) % MERSENNE_PRIME for h in hashes]) & MAX_HASH
+                           for a, b in self._permutations])
+
+    def band_keys(self, signature):
+        """[(band, bucket)] for a signature; buckets are signed 64-bit so they fit a BIGINT column."""
+        keys = []
+        r = self.rows_per_band
+        for band in range(self.bands):
+            raw = struct.pack(f"<{r}I", *signature[band * r:(band + 1) * r])
+            keys.append((band, int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little", signed=True)))
+        return keys
+
+    def pack(self, signature):
+        return struct.pack(self._format, *signature)
+
+    def unpack(self, data):
+        return array("I", struct.unpack(self._format, data))
+
+    @staticmethod
+    def similarity(a, b):
+        """Estimated Jaccard similarity of the texts behind two signatures."""
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class LSHIndex:
+    """In-memory bucket index, used for offline rebuilds and benchmarks."""
+
+    def __init__(self, hasher):
+        self.hasher = hasher
+        self._buckets = {}     # (band, bucket) -> [key, ...]
+        self._signatures = {}  # key -> signature
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def add(self, key, signature):
+        self._signatures[key] = signature
+        for band_key in self.hasher.band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def query(self, signature, threshold, max_candidates=200):
+        """[(key, similarity)] at or above threshold, most similar first.
+
+        Only the max_candidates keys sharing the most bands are compared, so a
+        crowded bucket (a very common short text) cannot make a lookup linear.
+        """
+        hits = Counter()
+        for band_key in self.hasher.band_keys(signature):
+            hits.update(self._buckets.get(band_key, ()))
+        matches = []
+        for key, _ in hits.most_common(max_candidates):
+            similarity = self.hasher.similarity(signature, self._signatures[key])
+            if similarity >= threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches
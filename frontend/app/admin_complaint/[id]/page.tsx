@@ -52,16 +52,20 @@ export default function ComplaintDetailsPage() {
       const res = await fetch(`http://127.0.0.1:5000/api/admin/update_status`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ complaint_id: id, new_status: status })
+        body: JSON.stringify({
+          complaint_id: id,
+          new_status: status,
+          expected_version: complaint.complaint_version
+        })
       });
 
       const result = await res.json();
       if (result.status === 'success') {
-        setComplaint({ ...complaint, complaint_status: status });
+        setComplaint({ ...complaint, complaint_status: status, complaint_version: result.complaint_version });
         setStatusMessage('Status updated successfully!');
         setStatusColor('text-green-600');
       } else {
-        setStatusMessage('Failed to update status.');
+        setStatusMessage(result.message || 'Failed to update status.');
         setStatusColor('text-red-600');
       }
     } catch (error) {
@@ -24,32 +24,8 @@ const [selectedStatus, setSelectedStatus] = useState("All");
 
   const router = useRouter();
 
-  useEffect(() => {
-    const fetchComplaints = async () => {
-      try {
-        const res = await fetch('http://127.0.0.1:5000/api/admin/get_all_complaints');
-        const data = await res.json();
-
-        if (Array.isArray(data)) {
-          setComplaints(data);
-        } else if (Array.isArray(data.complaints)) {
-          setComplaints(data.complaints);
-        } else {
-          setComplaints([]);
-        }
-      } catch (error) {
-        console.error('Failed to fetch complaints:', error);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    fetchComplaints();
-  }, []);
-
-  const filteredComplaints = complaints.filter((complaint) => {
-  const typeMatch =
-    selectedType === "All" || complaint.complaint_type === selectedType;
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const normalizedStatus =
     selectedStatus === "responded"
@@ -60,12 +36,56 @@ const [selectedStatus, setSelectedStatus] = useState("All");
       ? "under_review"
       : selectedStatus;
 
-  const statusMatch =
-    selectedStatus === "All" ||
-    complaint.complaint_status === normalizedStatus;
+  // Filtering and paging happen on the server; we only keep the pages loaded so far
+  const fetchComplaints = async (cursor: string | null) => {
+    const params = new URLSearchParams();
+    if (selectedType !== "All") params.set('type', selectedType);
+    if (selectedStatus !== "All") params.set('status', normalizedStatus);
+    if (cursor) params.set('cursor', cursor);
+
+    const res = await fetch(`http://127.0.0.1:5000/api/admin/get_all_complaints?${params.toString()}`);
+    const data = await res.json();
+
+    if (Array.isArray(data)) {
+      return { complaints: data, next_cursor: null };
+    } else if (Array.isArray(data.complaints)) {
+      return { complaints: data.complaints, next_cursor: data.next_cursor ?? null };
+    }
+    return { complaints: [], next_cursor: null };
+  };
+
+  useEffect(() => {
+    const loadFirstPage = async () => {
+      setLoading(true);
+      try {
+        const page = await fetchComplaints(null);
+        setComplaints(page.complaints);
+        setNextCursor(page.next_cursor);
+      } catch (error) {
+        console.error('Failed to fetch complaints:', error);
+      } finally {
+        setLoading(false);
+      }
+    };
+
+    loadFirstPage();
+  }, [selectedType, selectedStatus]);
+
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchComplaints(nextCursor);
+      setComplaints((prev) => [...prev, ...page.complaints]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Failed to fetch complaints:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
-  return typeMatch && statusMatch;
-});
+  const filteredComplaints = complaints;
 
 
 
@@ -185,6 +205,17 @@ const typeLabels: { [key: string]: string } = {
               ))}
             </tbody>
           </table>
+          {nextCursor && (
+            <div className="p-4 text-center">
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="bg-[#003087] text-white px-6 py-2 rounded hover:bg-blue-800"
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -24,6 +24,7 @@ export default function LoginPage() {
       if (res.ok) {
         localStorage.setItem('student_email', email);
         localStorage.setItem('role', data.role);
+        localStorage.setItem('token', data.token);
 
         if (data.role === 'admin') {
           localStorage.setItem('admin_email', email);
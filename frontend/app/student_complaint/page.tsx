@@ -32,7 +32,10 @@ export default function ComplaintsPage() {
         return;
       }
 
-      const res = await fetch(`http://127.0.0.1:5000/api/student/showcomplaints?student_email=${email}`);
+      const token = localStorage.getItem("token");
+      const res = await fetch(`http://127.0.0.1:5000/api/student/showcomplaints?student_email=${email}`, {
+        headers: token ? { Authorization: `Bearer ${token}` } : {},
+      });
       const data = await res.json();
       console.log("Fetched complaints:", data);
 
@@ -34,6 +34,7 @@ const handleSubmit = async (e: React.FormEvent) => {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
+      ...(localStorage.getItem('token') ? { Authorization: `Bearer ${localStorage.getItem('token')}` } : {}),
     },
     body: JSON.stringify({
       student_email,
@@ -0,0 +1,286 @@
+"""Per-request performance metrics: SQL query count, DB time, serialization time and latency.
+
+SQLAlchemy cursor events time every statement; Flask request signals open and
+close a RequestMetrics record per request, so each statement is charged to the
+route that issued it. Aggregates are exported in Prometheus text format.
+Metrics are per process: with several gunicorn workers each one reports its own.
+"""
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, has_request_context, request, request_finished, request_started, got_request_exception
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+ENVIRON_KEY = "complaints.request_metrics"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestMetrics:
+    __slots__ = ("route", "method", "started", "queries", "db_time", "serialization_time")
+
+    def __init__(self, route, method):
+        self.route = route
+        self.method = method
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+HISTOGRAMS = (
+    ("http_request_duration_seconds", "Total request latency, including streamed bodies.", LATENCY_BUCKETS),
+    ("http_request_db_seconds", "Time spent executing SQL per request.", LATENCY_BUCKETS),
+    ("http_request_serialization_seconds", "Time spent encoding response bodies per request.", LATENCY_BUCKETS),
+    ("http_request_queries", "SQL statements executed per request.", QUERY_COUNT_BUCKETS),
+)
+
+
+class QueryRecorder:
+    """Statements executed inside a count_queries() block."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+class Instrumentation:
+    """Wires SQLAlchemy and Flask hooks together and keeps the per-route aggregates.
+
+    slow_query_ms: statements slower than this are logged with their parameters
+    (0 disables the log).
+    """
+
+    def __init__(self, app=None, slow_query_ms=200, log_parameters=True):
+        self.slow_query_ms = slow_query_ms
+        self.log_parameters = log_parameters
+        self._lock = threading.Lock()
+        self._routes = {}  # (route, method) -> [Histogram, ...] in HISTOGRAMS order
+        self._responses = {}  # (route, method, status) -> count
+        self._slow_queries = 0
+        self._recorders = []
+        self._collectors = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.slow_query_ms = app.config.get("SLOW_QUERY_MS", self.slow_query_ms)
+        self.log_parameters = app.config.get("SLOW_QUERY_LOG_PARAMS", self.log_parameters)
+        event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(Engine, "handle_error", self._handle_error)
+        request_started.connect(self._request_started, app)
+        request_finished.connect(self._request_finished, app)
+        got_request_exception.connect(self._request_failed, app)
+        app.json = InstrumentedJSONProvider(app, self)
+        app.add_url_rule("/metrics", "metrics", self.metrics_view)
+
+    # SQLAlchemy hooks
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        metrics = self.current()
+        if metrics is not None:
+            metrics.queries += 1
+            metrics.db_time += elapsed
+        for recorder in self._recorders:
+            recorder.statements.append(statement)
+        if self.slow_query_ms and elapsed * 1000 >= self.slow_query_ms:
+            with self._lock:
+                self._slow_queries += 1
+            route = f" [{metrics.method} {metrics.route}]" if metrics is not None else ""
+            if self.log_parameters:
+                logger.warning("Slow query (%.1f ms)%s: %s; parameters=%s", elapsed * 1000, route, statement,
+                               _truncate(parameters))
+            else:
+                logger.warning("Slow query (%.1f ms)%s: %s", elapsed * 1000, route, statement)
+
+    def _handle_error(self, context):
+        # a failed statement never reaches after_cursor_execute; drop its start time so
+        # the pooled connection's stack doesn't pair later statements with stale entries
+        conn = context.connection
+        if conn is not None and not conn.closed:
+            started = conn.info.get("query_started")
+            if started:
+                started.pop()
+
+    # Flask hooks
+    @staticmethod
+    def current():
+        # kept in the WSGI environ rather than g: stream_with_context re-pushes the
+        # request but not the original app context, and streamed bodies run queries too
+        return request.environ.get(ENVIRON_KEY) if has_request_context() else None
+
+    def _request_started(self, sender, **extra):
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        request.environ[ENVIRON_KEY] = RequestMetrics(route, request.method)
+
+    def _request_finished(self, sender, response, **extra):
+        metrics = self.current()
+        if metrics is None:
+            return
+        if response.is_streamed:
+            # The body is generated after this signal; time it as it is consumed
+            # and record the request once it has been sent or abandoned.
+            response.response = self._timed_body(response.response, metrics, response.status_code)
+        else:
+            self._record(metrics, response.status_code)
+
+    def _request_failed(self, sender, exception, **extra):
+        metrics = self.current()
+        if metrics is not None:
+            self._record(metrics, 500)
+            request.environ[ENVIRON_KEY] = None
+
+    def _timed_body(self, body, metrics, status):
+        iterator = iter(body)
+        try:
+            while True:
+                db_before = metrics.db_time
+                started = time.perf_counter()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    # time spent building the chunk that was not spent in the database
+                    metrics.serialization_time += (time.perf_counter() - started) - (metrics.db_time - db_before)
+                yield chunk
+        finally:
+            close = getattr(body, "close", None)
+            if close is not None:
+                close()
+            self._record(metrics, status)
+
+    def _record(self, metrics, status):
+        values = (time.perf_counter() - metrics.started, metrics.db_time, metrics.serialization_time, metrics.queries)
+        key = (metrics.route, metrics.method)
+        with self._lock:
+            histograms = self._routes.get(key)
+            if histograms is None:
+                histograms = self._routes[key] = [Histogram(buckets) for _, _, buckets in HISTOGRAMS]
+            for histogram, value in zip(histograms, values):
+                histogram.observe(value)
+            response_key = key + (status,)
+            self._responses[response_key] = self._responses.get(response_key, 0) + 1
+
+    @contextmanager
+    def serializing(self):
+        """Charge the enclosed block to the current request's serialization time."""
+        metrics = self.current()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if metrics is not None:
+                metrics.serialization_time += time.perf_counter() - started
+
+    # Export
+    def render(self):
+        with self._lock:
+            routes = {key: list(histograms) for key, histograms in self._routes.items()}
+            responses = dict(self._responses)
+            slow_queries = self._slow_queries
+        lines = ["# HELP http_requests_total Requests handled, by route, method and status.",
+                 "# TYPE http_requests_total counter"]
+        for (route, method, status), count in sorted(responses.items()):
+            lines.append(f'http_requests_total{{route="{_escape(route)}",method="{method}",status="{status}"}} {count}')
+        for i, (name, help_text, _) in enumerate(HISTOGRAMS):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (route, method), histograms in sorted(routes.items()):
+                lines.extend(histograms[i].render(name, f'route="{_escape(route)}",method="{method}"'))
+        lines.append("# HELP sql_slow_queries_total Statements slower than the slow-query threshold.")
+        lines.append("# TYPE sql_slow_queries_total counter")
+        lines.append(f"sql_slow_queries_total {slow_queries}")
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+    def add_collector(self, collector):
+        """Append collector()'s Prometheus lines to every /metrics render."""
+        self._collectors.append(collector)
+
+    def metrics_view(self):
+        return Response(self.render(), mimetype="text/plain; version=0.0.4")
+
+    # Test helpers
+    @contextmanager
+    def count_queries(self):
+        """Record every statement executed inside the block, on any thread."""
+        recorder = QueryRecorder()
+        self._recorders.append(recorder)
+        try:
+            yield recorder
+        finally:
+            self._recorders.remove(recorder)
+
+    @contextmanager
+    def assert_max_queries(self, limit):
+        """Fail if the enclosed block (e.g. one test-client request) runs more than limit statements.
+
+            with instrumentation.assert_max_queries(2):
+                client.get("/api/admin/get_all_complaints")
+        """
+        with self.count_queries() as recorder:
+            yield recorder
+        if recorder.count > limit:
+            listing = "\n".join(f"  {i}. {s}" for i, s in enumerate(recorder.statements, 1))
+            raise AssertionError(f"expected at most {limit} queries, got {recorder.count}:\n{listing}")
+
+
+class InstrumentedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, with encoding time charged to the current request."""
+
+    def __init__(self, app, instrumentation):
+        super().__init__(app)
+        self.instrumentation = instrumentation
+
+    def dumps(self, obj, **kwargs):
+        with self.instrumentation.serializing():
+            return super().dumps(obj, **kwargs)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _truncate(parameters, limit=500):
+    text = repr(parameters)
+    return text if len(text) <= limit else text[:limit] + "..."
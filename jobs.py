@@ -0,0 +1,127 @@
+import logging
+import random
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+
+class JobRegistry:
+    """Maps job kinds to handler functions.
+
+    A handler receives the job payload and runs inside the worker's
+    transaction, so its writes commit together with the job being marked
+    done. It may return a callable to run after that commit (e.g. pushing
+    an event to live clients).
+    """
+
+    def __init__(self):
+        self.handlers = {}
+
+    def handler(self, kind):
+        def register(fn):
+            self.handlers[kind] = fn
+            return fn
+        return register
+
+
+class JobQueue:
+    """Postgres-backed job queue: rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED.
+
+    A claimed job stays row-locked for as long as its handler runs, so a
+    crashed worker's job is simply picked up again once its connection drops.
+    Failures are retried with exponential backoff; after max attempts the
+    job is dead-lettered (status 'dead') for someone to inspect.
+    """
+
+    def __init__(self, db, job_model, status_enum, registry, base_delay=5, max_delay=3600, default_max_attempts=5):
+        self.db = db
+        self.model = job_model
+        self.status = status_enum
+        self.registry = registry
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.default_max_attempts = default_max_attempts
+
+    def enqueue(self, kind, payload, delay=0, max_attempts=None):
+        """Add a job to the current session; it becomes visible when the caller commits."""
+        if kind not in self.registry.handlers:
+            raise ValueError(f"no handler registered for job kind {kind!r}")
+        job = self.model(
+            job_kind=kind,
+            job_payload=payload,
+            job_status=self.status.queued,
+            job_attempts=0,
+            job_max_attempts=max_attempts or self.default_max_attempts,
+            job_run_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+        )
+        self.db.session.add(job)
+        return job
+
+    def backoff(self, attempts):
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def run_one(self):
+        """Claim and run at most one due job. Returns False when nothing was due."""
+        session = self.db.session
+        model = self.model
+        now = datetime.now(timezone.utc)
+        job = session.query(model) \
+            .filter(model.job_status == self.status.queued, model.job_run_at <= now) \
+            .order_by(model.job_run_at) \
+            .with_for_update(skip_locked=True) \
+            .limit(1).first()
+        if job is None:
+            session.rollback()
+            return False
+
+        job.job_attempts += 1
+        job.job_updated_at = now
+        after_commit = None
+        try:
+            handler = self.registry.handlers.get(job.job_kind)
+            if handler is None:
+                raise LookupError(f"no handler registered for job kind {job.job_kind!r}")
+            with session.begin_nested():
+                after_commit = handler(job.job_payload)
+            job.job_status = self.status.done
+            job.job_last_error = None
+        except Exception:
+            # the savepoint undid the handler's writes; the job row is still ours to update
+            job.job_last_error = traceback.format_exc(limit=5)
+            if job.job_attempts >= job.job_max_attempts:
+                job.job_status = self.status.dead
+                logger.error("Job %s (%s) dead-lettered after %d attempts", job.job_id, job.job_kind, job.job_attempts)
+            else:
+                job.job_run_at = now + timedelta(seconds=self.backoff(job.job_attempts))
+                logger.warning("Job %s (%s) failed, retrying", job.job_id, job.job_kind)
+        session.commit()
+
+        if after_commit is not None:
+            try:
+                after_commit()
+            except Exception:
+                logger.exception("After-commit hook of job %s failed", job.job_id)
+        return True
+
+    def run(self, poll_interval=1.0, once=False, stop=None):
+        """Work until stopped; with once=True, drain the due jobs and return how many ran."""
+        processed = 0
+        while stop is None or not stop.is_set():
+            try:
+                ran = self.run_one()
+            except Exception:
+                logger.exception("Job worker error")
+                self.db.session.rollback()
+                ran = False
+                if once:
+                    raise
+            if ran:
+                processed += 1
+                continue
+            if once:
+                break
+            time.sleep(poll_interval)
+        return processed
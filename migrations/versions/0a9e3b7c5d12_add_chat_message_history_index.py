@@ -0,0 +1,28 @@
+"""Add (session_id, created_at) index for chat history paging
+
+Revision ID: 0a9e3b7c5d12
+Revises: f61c2e8d7a95
+Create Date: 2026-10-18 11:32:48.219305
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0a9e3b7c5d12'
+down_revision = 'f61c2e8d7a95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_chat_messages_session_created', 'chat_messages',
+                        ['session_id', 'created_at', 'chat_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_chat_messages_session_created', table_name='chat_messages',
+                      postgresql_concurrently=True, if_exists=True)
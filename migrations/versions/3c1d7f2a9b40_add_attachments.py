@@ -0,0 +1,41 @@
+"""Add content-addressed attachments table
+
+Revision ID: 3c1d7f2a9b40
+Revises: 669ff2ad25bf
+Create Date: 2026-10-18 09:12:03.418220
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '3c1d7f2a9b40'
+down_revision = '669ff2ad25bf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('attachments',
+        sa.Column('attachment_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('attachment_sha256', sa.String(length=64), nullable=False),
+        sa.Column('attachment_size', sa.BigInteger(), nullable=False),
+        sa.Column('attachment_filename', sa.Text(), nullable=True),
+        sa.Column('attachment_content_type', sa.Text(), nullable=False),
+        sa.Column('complaint_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('suggestion_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('attachment_created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['complaint_id'], ['complaints.complaint_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['suggestion_id'], ['suggestions.suggestion_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('attachment_id')
+    )
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_attachments_attachment_sha256'), ['attachment_sha256'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_attachments_attachment_sha256'))
+
+    op.drop_table('attachments')
@@ -0,0 +1,40 @@
+"""Add jobs table for the background job queue
+
+Revision ID: 5b8d1f6e2c34
+Revises: 0a9e3b7c5d12
+Create Date: 2026-10-18 12:05:26.731840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5b8d1f6e2c34'
+down_revision = '0a9e3b7c5d12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs',
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('job_kind', sa.Text(), nullable=False),
+        sa.Column('job_payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('job_status', postgresql.ENUM('queued', 'done', 'dead', name='jobstatus'), nullable=False),
+        sa.Column('job_attempts', sa.Integer(), nullable=False),
+        sa.Column('job_max_attempts', sa.Integer(), nullable=False),
+        sa.Column('job_run_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('job_last_error', sa.Text(), nullable=True),
+        sa.Column('job_created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('job_updated_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index('ix_jobs_queued_run_at', 'jobs', ['job_run_at'], unique=False,
+                    postgresql_where=sa.text("job_status = 'queued'"))
+
+
+def downgrade():
+    op.drop_index('ix_jobs_queued_run_at', table_name='jobs', postgresql_where=sa.text("job_status = 'queued'"))
+    op.drop_table('jobs')
+    postgresql.ENUM(name='jobstatus').drop(op.get_bind(), checkfirst=True)
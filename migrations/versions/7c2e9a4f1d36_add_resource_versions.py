@@ -0,0 +1,29 @@
+"""Add resource_versions table for conditional GET version counters
+
+Revision ID: 7c2e9a4f1d36
+Revises: 5b8d1f6e2c34
+Create Date: 2026-10-18 13:40:12.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9a4f1d36'
+down_revision = '5b8d1f6e2c34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resource_versions',
+        sa.Column('resource_scope', sa.Text(), nullable=False),
+        sa.Column('resource_version', sa.BigInteger(), nullable=False),
+        sa.Column('resource_updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('resource_scope')
+    )
+
+
+def downgrade():
+    op.drop_table('resource_versions')
@@ -0,0 +1,45 @@
+"""Add composite indexes for complaint and user filters
+
+Revision ID: 8e4b6a1f0c27
+Revises: 3c1d7f2a9b40
+Create Date: 2026-10-18 09:40:51.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4b6a1f0c27'
+down_revision = '3c1d7f2a9b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction, but it keeps the tables writable while building
+    with op.get_context().autocommit_block():
+        op.create_index('ix_complaints_sender_created', 'complaints',
+                        ['sender_id', sa.text('complaint_created_at DESC')],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_complaints_status_created', 'complaints',
+                        ['complaint_status', 'complaint_created_at'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_complaints_created_id', 'complaints',
+                        ['complaint_created_at', 'complaint_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_complaints_responder_id', 'complaints',
+                        ['responder_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_users_role_name', 'users',
+                        ['users_role', 'users_name'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_role_name', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_complaints_responder_id', table_name='complaints', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_complaints_created_id', table_name='complaints', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_complaints_status_created', table_name='complaints', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_complaints_sender_created', table_name='complaints', postgresql_concurrently=True, if_exists=True)
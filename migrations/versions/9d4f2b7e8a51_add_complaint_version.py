@@ -0,0 +1,25 @@
+"""Add complaint_version for optimistic locking
+
+Revision ID: 9d4f2b7e8a51
+Revises: 7c2e9a4f1d36
+Create Date: 2026-10-18 14:22:47.905163
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f2b7e8a51'
+down_revision = '7c2e9a4f1d36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # a constant default is metadata-only on Postgres 11+, so this doesn't rewrite the table
+    op.add_column('complaints', sa.Column('complaint_version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('complaints', 'complaint_version')
@@ -0,0 +1,124 @@
+"""Add complaints_archive for resolved complaints moved out of the hot table
+
+Revision ID: a4c8e2f17b93
+Revises: e3a7c1d94f60
+Create Date: 2026-10-18 16:10:42.905317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e2f17b93'
+down_revision = 'e3a7c1d94f60'
+branch_labels = None
+depends_on = None
+
+
+def stats_views(source, response_source):
+    return (
+        f"""
+        CREATE MATERIALIZED VIEW complaint_stats_daily AS
+        SELECT (complaint_created_at AT TIME ZONE 'UTC')::date AS stat_day,
+               complaint_status, complaint_type, complaint_dep,
+               count(*) AS complaint_count
+        FROM {source}
+        GROUP BY 1, 2, 3, 4
+        """,
+        "CREATE UNIQUE INDEX ux_complaint_stats_daily ON complaint_stats_daily "
+        "(stat_day, complaint_status, complaint_type, complaint_dep)",
+        f"""
+        CREATE MATERIALIZED VIEW complaint_response_stats AS
+        SELECT 1 AS singleton,
+               count(*) AS responded_count,
+               percentile_cont(0.5) WITHIN GROUP (
+                   ORDER BY extract(epoch FROM response_created_at - complaint_created_at)
+               ) AS median_response_seconds,
+               now() AS refreshed_at
+        FROM {response_source}
+        WHERE response_created_at IS NOT NULL
+        """,
+        "CREATE UNIQUE INDEX ux_complaint_response_stats ON complaint_response_stats (singleton)",
+    )
+
+
+def replace_stats_views(statements):
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS complaint_response_stats")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS complaint_stats_daily")
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade():
+    op.create_table('complaints_archive',
+        sa.Column('complaint_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('sender_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('complaint_type', postgresql.ENUM(name='complainttype', create_type=False), nullable=False),
+        sa.Column('complaint_dep', postgresql.ENUM(name='complaintdep', create_type=False), nullable=False),
+        sa.Column('complaint_status', postgresql.ENUM(name='complaintstatus', create_type=False), nullable=False),
+        sa.Column('complaint_title', sa.String(length=100), nullable=True),
+        sa.Column('complaint_message', sa.Text(), nullable=False),
+        sa.Column('complaint_file', postgresql.BYTEA(), nullable=True),
+        sa.Column('complaint_created_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('responder_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('response_message', sa.Text(), nullable=True),
+        sa.Column('response_created_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('complaint_version', sa.Integer(), server_default='1', nullable=False),
+        sa.Column('complaint_search', postgresql.TSVECTOR(), sa.Computed(
+            "to_tsvector('english', coalesce(complaint_title, '') || ' ' || complaint_message)", persisted=True)),
+        sa.Column('complaint_archived_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'),
+                  nullable=False),
+        sa.ForeignKeyConstraint(['sender_id'], ['users.users_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['responder_id'], ['users.users_id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('complaint_id')
+    )
+    # the table starts empty, so plain index builds are instant
+    op.create_index('ix_complaints_archive_search', 'complaints_archive', ['complaint_search'],
+                    postgresql_using='gin')
+    op.create_index('ix_complaints_archive_sender_created', 'complaints_archive',
+                    ['sender_id', sa.text('complaint_created_at DESC')])
+    op.create_index('ix_complaints_archive_created_id', 'complaints_archive', ['complaint_created_at', 'complaint_id'])
+    op.create_index('ix_complaints_archive_responder_id', 'complaints_archive', ['responder_id'])
+
+    # every existing row is NULL, so the new foreign key validates without a long scan
+    op.add_column('attachments', sa.Column('archived_complaint_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key('attachments_archived_complaint_id_fkey', 'attachments', 'complaints_archive',
+                          ['archived_complaint_id'], ['complaint_id'], ondelete='CASCADE')
+
+    # dashboard totals keep counting complaints after they are archived
+    replace_stats_views(stats_views(
+        "(SELECT complaint_created_at, complaint_status, complaint_type, complaint_dep FROM complaints "
+        "UNION ALL SELECT complaint_created_at, complaint_status, complaint_type, complaint_dep "
+        "FROM complaints_archive) c",
+        "(SELECT complaint_created_at, response_created_at FROM complaints "
+        "UNION ALL SELECT complaint_created_at, response_created_at FROM complaints_archive) c"))
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_attachments_archived_complaint_id', 'attachments', ['archived_complaint_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+ARCHIVED_COLUMNS = ('complaint_id, sender_id, complaint_type, complaint_dep, complaint_status, complaint_title, '
+                    'complaint_message, complaint_file, complaint_created_at, responder_id, response_message, '
+                    'response_created_at, complaint_version')
+
+
+def downgrade():
+    # put archived complaints back before their table goes away
+    op.execute(f"INSERT INTO complaints ({ARCHIVED_COLUMNS}) SELECT {ARCHIVED_COLUMNS} FROM complaints_archive")
+    op.execute("UPDATE attachments SET complaint_id = archived_complaint_id WHERE archived_complaint_id IS NOT NULL")
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_attachments_archived_complaint_id', table_name='attachments',
+                      postgresql_concurrently=True, if_exists=True)
+
+    replace_stats_views(stats_views("complaints", "complaints"))
+
+    op.drop_constraint('attachments_archived_complaint_id_fkey', 'attachments', type_='foreignkey')
+    op.drop_column('attachments', 'archived_complaint_id')
+    op.drop_index('ix_complaints_archive_responder_id', table_name='complaints_archive')
+    op.drop_index('ix_complaints_archive_created_id', table_name='complaints_archive')
+    op.drop_index('ix_complaints_archive_sender_created', table_name='complaints_archive')
+    op.drop_index('ix_complaints_archive_search', table_name='complaints_archive')
+    op.drop_table('complaints_archive')
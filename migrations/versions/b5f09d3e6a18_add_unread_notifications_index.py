@@ -0,0 +1,30 @@
+"""Add partial index on unread notifications
+
+Revision ID: b5f09d3e6a18
+Revises: 8e4b6a1f0c27
+Create Date: 2026-10-18 09:44:10.377652
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5f09d3e6a18'
+down_revision = '8e4b6a1f0c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_notifications_user_unread', 'notifications',
+                        ['user_id', sa.text('notification_created_at DESC')],
+                        postgresql_where=sa.text('notification_is_read = false'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_notifications_user_unread', table_name='notifications',
+                      postgresql_concurrently=True, if_exists=True)
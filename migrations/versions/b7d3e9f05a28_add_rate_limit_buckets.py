@@ -0,0 +1,30 @@
+"""Add rate_limit_buckets for token buckets shared across workers
+
+Revision ID: b7d3e9f05a28
+Revises: c5f2a8d61e47
+Create Date: 2026-10-18 18:42:17.204863
+
+Only used with RATE_LIMIT_BACKEND=postgres.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e9f05a28'
+down_revision = 'c5f2a8d61e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('rate_limit_buckets',
+        sa.Column('bucket_key', sa.Text(), nullable=False),
+        sa.Column('bucket_tokens', sa.Float(), nullable=False),
+        sa.Column('bucket_updated_at', sa.Float(), nullable=False),
+        sa.Column('bucket_admitted', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('bucket_key')
+    )
+
+
+def downgrade():
+    op.drop_table('rate_limit_buckets')
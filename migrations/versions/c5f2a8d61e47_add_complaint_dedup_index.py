@@ -0,0 +1,47 @@
+"""Add MinHash signatures and LSH buckets for duplicate complaint detection
+
+Revision ID: c5f2a8d61e47
+Revises: a4c8e2f17b93
+Create Date: 2026-10-18 17:24:09.631852
+
+Existing complaints are not indexed by the migration; run
+`flask rebuild-duplicate-index` once it has been applied.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c5f2a8d61e47'
+down_revision = 'a4c8e2f17b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('complaint_signatures',
+        sa.Column('complaint_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('signature', postgresql.BYTEA(), nullable=False),
+        sa.Column('cluster_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(['complaint_id'], ['complaints.complaint_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('complaint_id')
+    )
+    op.create_index('ix_complaint_signatures_cluster_id', 'complaint_signatures', ['cluster_id'])
+    op.create_index('ix_complaint_signatures_duplicates', 'complaint_signatures', ['cluster_id'],
+                    postgresql_where=sa.text('cluster_id <> complaint_id'))
+    op.create_table('complaint_lsh_buckets',
+        sa.Column('lsh_band', sa.SmallInteger(), nullable=False),
+        sa.Column('lsh_bucket', sa.BigInteger(), nullable=False),
+        sa.Column('complaint_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(['complaint_id'], ['complaints.complaint_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('lsh_band', 'lsh_bucket', 'complaint_id')
+    )
+    op.create_index('ix_complaint_lsh_buckets_complaint_id', 'complaint_lsh_buckets', ['complaint_id'])
+
+
+def downgrade():
+    op.drop_index('ix_complaint_lsh_buckets_complaint_id', table_name='complaint_lsh_buckets')
+    op.drop_table('complaint_lsh_buckets')
+    op.drop_index('ix_complaint_signatures_duplicates', table_name='complaint_signatures')
+    op.drop_index('ix_complaint_signatures_cluster_id', table_name='complaint_signatures')
+    op.drop_table('complaint_signatures')
@@ -0,0 +1,45 @@
+"""Add materialized views for dashboard statistics
+
+Revision ID: d2a7c94e1b53
+Revises: b5f09d3e6a18
+Create Date: 2026-10-18 10:21:37.560194
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7c94e1b53'
+down_revision = 'b5f09d3e6a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS complaint_stats_daily AS
+        SELECT (complaint_created_at AT TIME ZONE 'UTC')::date AS stat_day,
+               complaint_status, complaint_type, complaint_dep,
+               count(*) AS complaint_count
+        FROM complaints
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_complaint_stats_daily ON complaint_stats_daily "
+               "(stat_day, complaint_status, complaint_type, complaint_dep)")
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS complaint_response_stats AS
+        SELECT 1 AS singleton,
+               count(*) AS responded_count,
+               percentile_cont(0.5) WITHIN GROUP (
+                   ORDER BY extract(epoch FROM response_created_at - complaint_created_at)
+               ) AS median_response_seconds,
+               now() AS refreshed_at
+        FROM complaints
+        WHERE response_created_at IS NOT NULL
+    """)
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_complaint_response_stats ON complaint_response_stats (singleton)")
+
+
+def downgrade():
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS complaint_response_stats")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS complaint_stats_daily")
@@ -0,0 +1,30 @@
+"""Add revoked_tokens so logouts are shared by every worker
+
+Revision ID: d8e1a6c3f472
+Revises: b7d3e9f05a28
+Create Date: 2026-10-18 19:36:51.082417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'd8e1a6c3f472'
+down_revision = 'b7d3e9f05a28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('revoked_tokens',
+        sa.Column('token_jti', sa.Text(), nullable=False),
+        sa.Column('token_expires_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('token_jti')
+    )
+    op.create_index('ix_revoked_tokens_token_expires_at', 'revoked_tokens', ['token_expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_revoked_tokens_token_expires_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
@@ -0,0 +1,31 @@
+"""Add users_deleted_at for soft-deleted accounts
+
+Revision ID: e3a7c1d94f60
+Revises: 9d4f2b7e8a51
+Create Date: 2026-10-18 15:03:18.274690
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'e3a7c1d94f60'
+down_revision = '9d4f2b7e8a51'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('users_deleted_at', postgresql.TIMESTAMP(timezone=True), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_deleted_at', 'users', ['users_deleted_at'],
+                        postgresql_where=sa.text('users_deleted_at IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_deleted_at', table_name='users',
+                      postgresql_concurrently=True, if_exists=True)
+    op.drop_column('users', 'users_deleted_at')
@@ -0,0 +1,40 @@
+"""Add generated tsvector columns and GIN indexes for search
+
+Revision ID: f61c2e8d7a95
+Revises: d2a7c94e1b53
+Create Date: 2026-10-18 10:58:12.004731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f61c2e8d7a95'
+down_revision = 'd2a7c94e1b53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # adding a STORED generated column rewrites the table once
+    op.add_column('complaints', sa.Column('complaint_search', postgresql.TSVECTOR(), sa.Computed(
+        "to_tsvector('english', coalesce(complaint_title, '') || ' ' || complaint_message)", persisted=True)))
+    op.add_column('suggestions', sa.Column('suggestion_search', postgresql.TSVECTOR(), sa.Computed(
+        "to_tsvector('english', coalesce(suggestion_title, '') || ' ' || suggestion_message)", persisted=True)))
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_complaints_search', 'complaints', ['complaint_search'],
+                        postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_suggestions_search', 'suggestions', ['suggestion_search'],
+                        postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_suggestions_search', table_name='suggestions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_complaints_search', table_name='complaints', postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('suggestions', 'suggestion_search')
+    op.drop_column('complaints', 'complaint_search')
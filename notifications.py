@@ -0,0 +1,119 @@
+import json
+import logging
+import queue
+import select
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One listener's queue of events; a full queue drops events (the client resyncs on reconnect)."""
+
+    def __init__(self, broker, user_id, maxsize=100):
+        self.broker = broker
+        self.user_id = user_id
+        self.events = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout):
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Fans notification events out to subscribers in this process only."""
+
+    def __init__(self):
+        self._subscribers = {}  # user_id (str) -> set of Subscription
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = Subscription(self, str(user_id))
+        with self._lock:
+            self._subscribers.setdefault(subscription.user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id, event):
+        self._deliver(str(user_id), event)
+
+    def _deliver(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.events.put_nowait(event)
+            except queue.Full:
+                logger.warning("Dropping notification for slow subscriber of user %s", user_id)
+
+
+class PostgresBroker(InProcessBroker):
+    """Relays events between worker processes with Postgres LISTEN/NOTIFY.
+
+    publish() sends a NOTIFY; a background thread in every process LISTENs
+    and hands received events to that process's local subscribers.
+    """
+
+    def __init__(self, engine, channel="user_notifications"):
+        super().__init__()
+        self.engine = engine
+        self.channel = channel
+        self._listener = None
+        self._start_lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        self._ensure_listener()
+        return super().subscribe(user_id)
+
+    def publish(self, user_id, event):
+        payload = json.dumps({"user_id": str(user_id), "event": event})
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("SELECT pg_notify(%s, %s)", (self.channel, payload))
+            conn.commit()
+
+    def _ensure_listener(self):
+        with self._start_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name="notification-listener", daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        conn = self.engine.raw_connection()
+        try:
+            dbapi_conn = conn.driver_connection
+            dbapi_conn.set_session(autocommit=True)
+            with dbapi_conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            while True:
+                if select.select([dbapi_conn], [], [], 30) == ([], [], []):
+                    continue
+                dbapi_conn.poll()
+                while dbapi_conn.notifies:
+                    notify = dbapi_conn.notifies.pop(0)
+                    try:
+                        message = json.loads(notify.payload)
+                        self._deliver(message["user_id"], message["event"])
+                    except (ValueError, KeyError):
+                        logger.warning("Ignoring malformed notification payload")
+        except Exception:
+            logger.exception("Notification listener stopped")
+        finally:
+            conn.close()
+
+
+def create_broker(kind, engine=None):
+    if kind == "postgres":
+        return PostgresBroker(engine)
+    return InProcessBroker()
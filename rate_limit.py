@@ -0,0 +1,285 @@
+"""Admission control: token-bucket rate limits per caller and per IP, and per-route concurrency caps.
+
+A bucket holds up to `burst` tokens and refills at `rate` tokens per second;
+each request takes one token or is rejected with the time until the next one
+is due, so short bursts pass while the sustained rate stays bounded. A
+limited route can have two buckets per request, one keyed by the caller (the
+session token's user, else the email the request names) and one by client
+IP, and a request is admitted only if both have a token.
+
+Concurrency caps bound how many requests to an expensive route run at once
+in this process; requests over the cap are turned away immediately instead
+of queueing for database connections behind the ones already running.
+
+The memory backend keeps buckets per worker process, so under gunicorn with
+N workers a client may get up to N times the limit; the postgres backend keeps
+them in one table shared by every worker, at the cost of one statement per
+limited request.
+"""
+import logging
+import math
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from flask import request
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+logger = logging.getLogger(__name__)
+
+ENVIRON_KEY = "complaints.admission"
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+LIMIT_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+# rate in tokens per second, burst in tokens
+Limit = namedtuple("Limit", ["rate", "burst"])
+
+
+class RateLimited(Exception):
+    """Raised when a request is refused admission; callers should answer 429 (rate) or 503 (concurrency)."""
+
+    def __init__(self, retry_after=1, status=429):
+        super().__init__("Too many requests")
+        self.retry_after = retry_after
+        self.status = status
+
+
+def parse_limit(spec):
+    """'10/minute', '100/5minutes' or {'rate': '10/minute', 'burst': 30} -> Limit; None stays None."""
+    if spec is None or isinstance(spec, Limit):
+        return spec
+    burst = None
+    if isinstance(spec, dict):
+        burst = spec.get("burst")
+        spec = spec["rate"]
+    match = LIMIT_RE.match(spec)
+    if not match:
+        raise ValueError(f"Invalid rate limit {spec!r}, expected e.g. '10/minute'")
+    count, multiple, unit = int(match.group(1)), int(match.group(2) or 1), match.group(3)
+    return Limit(count / (multiple * PERIODS[unit]), int(burst) if burst is not None else count)
+
+
+class MemoryBackend:
+    """Token buckets in a bounded LRU dict, local to this process."""
+
+    def __init__(self, max_keys=100000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets = OrderedDict()  # key -> [tokens, updated_at]
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def take(self, key, limit):
+        """(admitted, retry_after_seconds) for one request against key's bucket."""
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(limit.burst), now]
+                # an evicted bucket comes back full, so dropping the oldest errs on the lenient side
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0
+            return False, (1 - bucket[0]) / limit.rate
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "memory", "keys": len(self._buckets), "evictions": self.evictions}
+
+
+class PostgresBackend:
+    """Token buckets in the rate_limit_buckets table, shared by every worker.
+
+    Refill and take happen in a single INSERT .. ON CONFLICT DO UPDATE, so the
+    row lock serialises concurrent requests for one key without a round trip
+    to read the bucket first. Statements run on their own pooled connection in
+    autocommit, outside the request's session and transaction.
+    """
+
+    def __init__(self, db, model, clock=time.time, purge_every=10000, idle_seconds=86400):
+        self.db = db
+        self.model = model
+        self._clock = clock
+        self.purge_every = purge_every
+        self.idle_seconds = idle_seconds
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def take(self, key, limit):
+        model = self.model
+        now = self._clock()
+        refilled = model.bucket_tokens + (now - model.bucket_updated_at) * limit.rate
+        refilled = self.db.case((refilled > limit.burst, limit.burst), else_=refilled)
+        admitted = refilled >= 1
+        stmt = pg_insert(model.__table__).values(
+            bucket_key=key, bucket_tokens=limit.burst - 1, bucket_updated_at=now, bucket_admitted=True)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.bucket_key],
+            set_={"bucket_tokens": self.db.case((admitted, refilled - 1), else_=refilled),
+                  "bucket_updated_at": now,
+                  "bucket_admitted": admitted},
+        ).returning(model.bucket_tokens, model.bucket_admitted)
+        with self.db.engine.begin() as conn:
+            tokens, allowed = conn.execute(stmt).one()
+            if self._due_for_purge():
+                conn.execute(self.db.delete(model).where(model.bucket_updated_at < now - self.idle_seconds))
+        return (True, 0) if allowed else (False, (1 - tokens) / limit.rate)
+
+    def _due_for_purge(self):
+        with self._lock:
+            self._calls += 1
+            return self.purge_every and self._calls % self.purge_every == 0
+
+    def stats(self):
+        return {"backend": "postgres"}
+
+
+def create_backend(kind, db=None, model=None, max_keys=100000):
+    if kind == "postgres":
+        return PostgresBackend(db, model)
+    return MemoryBackend(max_keys=max_keys)
+
+
+class ConcurrencyLimiter:
+    """Non-blocking per-route slot counter; try_acquire fails instead of waiting."""
+
+    def __init__(self, limits):
+        self.limits = dict(limits)
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, route):
+        limit = self.limits.get(route)
+        if limit is None:
+            return True
+        with self._lock:
+            active = self._active.get(route, 0)
+            if active >= limit:
+                return False
+            self._active[route] = active + 1
+            return True
+
+    def release(self, route):
+        with self._lock:
+            self._active[route] -= 1
+
+    def active(self):
+        with self._lock:
+            return dict(self._active)
+
+
+class RateLimiter:
+    """Checks every request against its route's limits before the view runs.
+
+    limits maps Flask endpoint names to {'per_user': spec, 'per_ip': spec};
+    the 'default' entry applies to endpoints without their own, and an
+    endpoint mapped to None is not rate limited. concurrency maps endpoint
+    names to the number of requests allowed to run at once per process.
+    identify(request) returns the caller key for per_user buckets, or None to
+    fall back to the client IP. If the backend fails, requests are admitted.
+    """
+
+    def __init__(self, app=None, backend=None, identify=None):
+        self.backend = backend
+        self.identify = identify
+        self.enabled = True
+        self.limits = {}
+        self.concurrency = ConcurrencyLimiter({})
+        self._lock = threading.Lock()
+        self._rejected = {}  # (route, reason) -> count
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get("RATE_LIMIT_ENABLED", True)
+        if self.backend is None:
+            self.backend = MemoryBackend(max_keys=app.config.get("RATE_LIMIT_MAX_KEYS", 100000))
+        self.limits = {
+            endpoint: None if spec is None else {scope: parse_limit(s) for scope, s in spec.items()}
+            for endpoint, spec in app.config.get("RATE_LIMITS", {}).items()
+        }
+        self.concurrency = ConcurrencyLimiter(app.config.get("CONCURRENCY_LIMITS", {}))
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _limits_for(self, endpoint):
+        return self.limits[endpoint] if endpoint in self.limits else self.limits.get("default")
+
+    def _before_request(self):
+        endpoint = request.endpoint
+        if not self.enabled or endpoint is None or request.method == "OPTIONS":
+            return
+        limits = self._limits_for(endpoint)
+        if limits:
+            ip = request.remote_addr or "unknown"
+            per_user = limits.get("per_user")
+            if per_user is not None:
+                caller = (self.identify(request) if self.identify else None) or f"ip:{ip}"
+                self._take(endpoint, "per_user", f"{endpoint}:user:{caller}", per_user)
+            per_ip = limits.get("per_ip")
+            if per_ip is not None:
+                self._take(endpoint, "per_ip", f"{endpoint}:ip:{ip}", per_ip)
+        if endpoint in self.concurrency.limits:
+            if not self.concurrency.try_acquire(endpoint):
+                self._reject(endpoint, "concurrency")
+                raise RateLimited(retry_after=1, status=503)
+            # released in teardown, or once a streamed body has been sent or abandoned
+            request.environ[ENVIRON_KEY] = endpoint
+
+    def _take(self, endpoint, scope, key, limit):
+        try:
+            admitted, retry_after = self.backend.take(key, limit)
+        except Exception:
+            logger.exception("Rate limit backend failed; admitting request")
+            return
+        if not admitted:
+            self._reject(endpoint, scope)
+            raise RateLimited(retry_after=max(1, math.ceil(retry_after)))
+
+    def _after_request(self, response):
+        # teardown can run before a streamed body is generated, so the body's close releases the slot
+        if response.is_streamed:
+            endpoint = request.environ.pop(ENVIRON_KEY, None)
+            if endpoint is not None:
+                response.call_on_close(lambda: self.concurrency.release(endpoint))
+        return response
+
+    def _teardown_request(self, exc):
+        endpoint = request.environ.pop(ENVIRON_KEY, None)
+        if endpoint is not None:
+            self.concurrency.release(endpoint)
+
+    def _reject(self, endpoint, reason):
+        key = (endpoint, reason)
+        with self._lock:
+            self._rejected[key] = self._rejected.get(key, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            rejected = dict(self._rejected)
+        return {
+            "enabled": self.enabled,
+            "rejected": [{"endpoint": endpoint, "reason": reason, "count": count}
+                         for (endpoint, reason), count in sorted(rejected.items())],
+            "active": self.concurrency.active(),
+            **self.backend.stats(),
+        }
+
+    def render_metrics(self):
+        """Prometheus lines for the rejection counters, appended to /metrics."""
+        with self._lock:
+            rejected = dict(self._rejected)
+        lines = ["# HELP http_requests_rejected_total Requests refused by admission control, by endpoint and reason.",
+                 "# TYPE http_requests_rejected_total counter"]
+        for (endpoint, reason), count in sorted(rejected.items()):
+            lines.append(f'http_requests_rejected_total{{endpoint="{endpoint}",reason="{reason}"}} {count}')
+        return lines
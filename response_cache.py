@@ -0,0 +1,139 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# A buffered response body, reusable for any request that carries the same ETag
+CachedResponse = namedtuple("CachedResponse", ["body", "mimetype", "etag", "last_modified"])
+
+
+class ResourceVersions:
+    """Version counters for cacheable read scopes, kept in the resource_versions table.
+
+    A scope is a string such as "students" or "complaints:user:<id>". Write
+    handlers bump the scopes they affect inside their own transaction, so a
+    version and the data it describes always commit together, and every
+    worker process sees the same counters.
+    """
+
+    def __init__(self, db, model, on_bump=None):
+        self.db = db
+        self.model = model
+        self.on_bump = on_bump
+
+    def bump(self, *scopes):
+        """Increment the given scopes in the current session; visible when the caller commits."""
+        scopes = sorted(set(s for s in scopes if s))
+        if not scopes:
+            return
+        model = self.model
+        now = datetime.now(timezone.utc)
+        stmt = pg_insert(model.__table__).values(
+            [{"resource_scope": s, "resource_version": 1, "resource_updated_at": now} for s in scopes])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.resource_scope],
+            set_={"resource_version": model.resource_version + 1, "resource_updated_at": now})
+        self.db.session.execute(stmt)
+        if self.on_bump is not None:
+            self.on_bump(scopes)
+
+    def get(self, scopes):
+        """Return {scope: (version, updated_at)}; scopes never bumped read as (0, None)."""
+        model = self.model
+        rows = self.db.session.query(model.resource_scope, model.resource_version, model.resource_updated_at) \
+            .filter(model.resource_scope.in_(scopes)).all()
+        # drivers without timezone support hand back naive UTC timestamps
+        found = {scope: (version, updated_at if updated_at is None or updated_at.tzinfo else
+                         updated_at.replace(tzinfo=timezone.utc)) for scope, version, updated_at in rows}
+        return {scope: found.get(scope, (0, None)) for scope in scopes}
+
+
+def make_etag(key, versions):
+    """A strong ETag for one cache key at the given scope versions."""
+    raw = repr((key, sorted((scope, version) for scope, (version, _) in versions.items())))
+    return hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+
+class ResponseCache:
+    """Bounded LRU of rendered response bodies, keyed by (cache key, ETag).
+
+    The ETag already encodes the scope versions, so a stale entry can never
+    be served; invalidate() only reclaims memory for scopes that were just
+    bumped in this process. Entries are capped both by count and total size.
+    """
+
+    def __init__(self, maxsize=1024, max_bytes=64 * 1024 * 1024, max_entry_bytes=1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries = OrderedDict()   # (key, etag) -> (CachedResponse, scopes)
+        self._scope_index = {}          # scope -> set of (key, etag)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, etag):
+        with self._lock:
+            entry = self._entries.get((key, etag))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((key, etag))
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, scopes, response):
+        if len(response.body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            self._drop((key, response.etag))
+            self._entries[(key, response.etag)] = (response, scopes)
+            self._bytes += len(response.body)
+            for scope in scopes:
+                self._scope_index.setdefault(scope, set()).add((key, response.etag))
+            while self._entries and (len(self._entries) > self.maxsize or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, entry_key):
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return
+        response, scopes = entry
+        self._bytes -= len(response.body)
+        for scope in scopes:
+            keys = self._scope_index.get(scope)
+            if keys is not None:
+                keys.discard(entry_key)
+                if not keys:
+                    del self._scope_index[scope]
+
+    def invalidate(self, scopes):
+        with self._lock:
+            for scope in scopes:
+                for entry_key in list(self._scope_index.get(scope, ())):
+                    self._drop(entry_key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._scope_index.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "maxsize": self.maxsize,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
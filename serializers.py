@@ -0,0 +1,158 @@
+import csv
+import enum
+import io
+import json
+import uuid
+from datetime import date, datetime
+from operator import attrgetter
+
+
+def _uuid(value):
+    return str(value) if value is not None else None
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _day(value):
+    return value.strftime("%Y-%m-%d") if value is not None else None
+
+
+def _identity(value):
+    return value
+
+
+def enum_table(enum_cls, attribute="name"):
+    """A converter that maps enum members (and None) to strings with one dict lookup."""
+    table = {member: getattr(member, attribute) for member in enum_cls}
+    table[None] = None
+    return table.__getitem__
+
+
+CONVERTERS = {
+    "uuid": _uuid,
+    "datetime": _isoformat,
+    "date": _day,
+    "raw": _identity,
+}
+
+
+class Field:
+    """One output key: where its value comes from and how it is turned into JSON."""
+
+    def __init__(self, key, source, convert="raw"):
+        self.key = key
+        self.source = source  # column or SQL expression selected for this field
+        self.convert = CONVERTERS[convert] if isinstance(convert, str) else convert
+
+
+class RowSerializer:
+    """Schema-driven serializer working on plain row tuples.
+
+    The select list, output keys and converters are fixed when the serializer
+    is built, so dumping a row is a zip over precomputed callables instead of
+    per-row attribute, enum and datetime handling.
+    """
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self.keys = tuple(f.key for f in fields)
+        self.converters = tuple(f.convert for f in fields)
+        self._attributes = attrgetter(*(getattr(f.source, "key", f.key) for f in fields))
+        self.dump = self._compile()
+
+    def _compile(self):
+        """Generate a dump(row) function with the keys and converters inlined.
+
+        Trailing columns beyond the declared fields are ignored, so callers can
+        select extra values (e.g. for a pagination cursor) in the same query.
+        """
+        namespace = {}
+        items = []
+        for i, (key, convert) in enumerate(zip(self.keys, self.converters)):
+            if convert is _identity:
+                items.append(f"{key!r}: row[{i}]")
+            else:
+                namespace[f"c{i}"] = convert
+                items.append(f"{key!r}: c{i}(row[{i}])")
+        source = "def dump(row):\n    return {" + ", ".join(items) + "}\n"
+        exec(source, namespace)
+        return namespace["dump"]
+
+    @property
+    def columns(self):
+        """What to pass to with_entities()/query() so rows line up with the fields."""
+        return [f.source for f in self.fields]
+
+    def adapted(self, adapt):
+        """The same schema selecting from elsewhere; adapt(source) returns each field's new column."""
+        return RowSerializer(*(Field(f.key, adapt(f.source), f.convert) for f in self.fields))
+
+    def dump_many(self, rows):
+        dump = self.dump
+        return [dump(row) for row in rows]
+
+    def dump_object(self, obj):
+        """Serialize an already-loaded ORM object with the same schema."""
+        values = self._attributes(obj)
+        return self.dump(values if len(self.fields) > 1 else (values,))
+
+    def stream_array(self, rows, chunk_rows=200):
+        """Yield a JSON array piece by piece, so large results never exist as one string."""
+        dump = self.dump
+        encode = json.JSONEncoder(ensure_ascii=False, default=_json_default).encode
+        yield "["
+        buffer = []
+        first = True
+        for row in rows:
+            buffer.append(dump(row))
+            if len(buffer) >= chunk_rows:
+                # one encoder call per chunk; strip the chunk's own brackets
+                yield ("" if first else ",") + encode(buffer)[1:-1]
+                first = False
+                buffer = []
+        if buffer:
+            yield ("" if first else ",") + encode(buffer)[1:-1]
+        yield "]"
+
+    def stream_ndjson(self, rows, chunk_bytes=64 * 1024):
+        """Yield newline-delimited JSON, one object per row, in roughly chunk_bytes pieces."""
+        dump = self.dump
+        encode = json.JSONEncoder(ensure_ascii=False, default=_json_default).encode
+        buffer = []
+        size = 0
+        for row in rows:
+            line = encode(dump(row))
+            buffer.append(line)
+            size += len(line) + 1
+            if size >= chunk_bytes:
+                yield "\n".join(buffer) + "\n"
+                buffer = []
+                size = 0
+        if buffer:
+            yield "\n".join(buffer) + "\n"
+
+    def stream_csv(self, rows, chunk_bytes=64 * 1024):
+        """Yield CSV with a header row of the field keys, in roughly chunk_bytes pieces."""
+        dump = self.dump
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(self.keys)
+        for row in rows:
+            writer.writerow(dump(row).values())
+            if output.tell() >= chunk_bytes:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        yield output.getvalue()
+
+
+def _json_default(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.name
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -0,0 +1,87 @@
+"""Production launcher: gunicorn with several worker processes.
+
+    python serve.py --workers 4 --threads 8 --bind 0.0.0.0:5000
+
+DB_MAX_CONNECTIONS is the connection budget for the whole server; it is
+split across workers (DB_POOL_SIZE per worker) unless DB_POOL_SIZE is set
+explicitly. Password hashing is split the same way: each worker runs its own
+scrypt process pool, so HASH_POOL_SIZE defaults to cpu_count // workers
+(at least 1) rather than a pool per CPU in every worker, and HASH_MAX_PENDING
+and the per-process login concurrency cap follow from it. On SIGTERM gunicorn stops accepting connections and gives
+in-flight requests --graceful-timeout seconds to finish.
+
+Workers are threaded (gthread), and an open /api/notifications/stream holds
+its thread for as long as the client stays connected. SSE_MAX_STREAMS caps
+the streams per worker (half of --threads by default); further streams get
+503 with Retry-After, so connected students can never take every thread from
+the other routes. Live events therefore reach at most workers * SSE_MAX_STREAMS
+clients at once; raise --threads or --workers to serve more.
+"""
+import argparse
+import multiprocessing
+import os
+
+from gunicorn.app.base import BaseApplication
+
+
+def worker_exit(server, worker):
+    from api import app, db, password_hasher, chat_bot_pool
+    password_hasher.shutdown()
+    chat_bot_pool.shutdown(wait=False)
+    with app.app_context():
+        db.engine.dispose()
+
+
+class ComplaintsServer(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from api import app
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API under gunicorn")
+    parser.add_argument("--bind", default=os.environ.get("BIND", "0.0.0.0:5000"))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1)))
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("WEB_THREADS", 8)))
+    parser.add_argument("--db-max-connections", type=int, default=int(os.environ.get("DB_MAX_CONNECTIONS", 40)))
+    parser.add_argument("--timeout", type=int, default=60)
+    parser.add_argument("--graceful-timeout", type=int, default=30)
+    parser.add_argument("--max-requests", type=int, default=10000, help="recycle workers to cap memory growth")
+    args = parser.parse_args()
+
+    # workers import api after fork and read these from the environment
+    if "DB_POOL_SIZE" not in os.environ:
+        per_worker = max(1, args.db_max_connections // args.workers)
+        os.environ["DB_POOL_SIZE"] = str(per_worker)
+        os.environ.setdefault("DB_MAX_OVERFLOW", str(max(0, min(per_worker, args.threads - per_worker))))
+    if "HASH_POOL_SIZE" not in os.environ:
+        os.environ["HASH_POOL_SIZE"] = str(max(1, multiprocessing.cpu_count() // args.workers))
+    os.environ.setdefault("NOTIFICATION_BROKER", "postgres")  # SSE events must cross worker processes
+    os.environ.setdefault("SSE_MAX_STREAMS", str(max(1, args.threads // 2)))
+
+    ComplaintsServer({
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread",
+        "timeout": args.timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests // 10,
+        # each worker imports the app itself, so no pool or process pool is shared across fork
+        "preload_app": False,
+        "worker_exit": worker_exit,
+        "accesslog": "-",
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
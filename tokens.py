@@ -0,0 +1,126 @@
+import threading
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+
+# Who the caller is, straight from the signed token; no database round-trip needed
+TokenIdentity = namedtuple("TokenIdentity", ["users_id", "role", "email", "jti", "issued_at"])
+
+
+class InvalidToken(Exception):
+    """Raised when a request sent a bearer token that does not verify; callers should answer 401."""
+
+
+class MemoryRevocations:
+    """Revocation keys held in this process; only right for a single-process server."""
+
+    def __init__(self, max_revoked=100000):
+        self.max_revoked = max_revoked
+        self._revoked = {}  # jti -> expires_at (epoch seconds)
+        self._lock = threading.Lock()
+
+    def add(self, jti, expires_at):
+        with self._lock:
+            self._revoked[jti] = expires_at
+            if len(self._revoked) > self.max_revoked:
+                self._prune(time.time())
+
+    def lookup(self, keys):
+        """{key: expires_at} for those of keys that are revoked."""
+        with self._lock:
+            return {key: self._revoked[key] for key in keys if key in self._revoked}
+
+    def _prune(self, now):
+        for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+            del self._revoked[jti]
+        # still too many live revocations: forget the ones closest to expiring
+        overflow = len(self._revoked) - self.max_revoked
+        if overflow > 0:
+            for jti, _ in sorted(self._revoked.items(), key=lambda item: item[1])[:overflow]:
+                del self._revoked[jti]
+
+
+class DatabaseRevocations:
+    """Revocation keys in the revoked_tokens table, so a logout or a user delete holds on every worker.
+
+    Each check is one primary-key lookup; rows are deleted once every token
+    they cover would have expired anyway, which add() does as it goes. add()
+    only stages its rows, so a revocation commits with the caller's transaction.
+    """
+
+    def __init__(self, db, model):
+        self.db = db
+        self.model = model
+
+    def add(self, jti, expires_at):
+        model = self.model
+        now = datetime.now(timezone.utc)
+        self.db.session.execute(self.db.delete(model).where(model.token_expires_at <= now))
+        self.db.session.merge(model(token_jti=jti,
+                                    token_expires_at=datetime.fromtimestamp(expires_at, timezone.utc)))
+
+    def lookup(self, keys):
+        model = self.model
+        rows = self.db.session.execute(
+            self.db.select(model.token_jti, model.token_expires_at).where(model.token_jti.in_(keys)))
+        return {key: expires_at.timestamp() for key, expires_at in rows}
+
+
+class TokenService:
+    """Issues and verifies stateless signed session tokens.
+
+    Tokens carry users_id and role, are signed with the app secret and expire
+    after max_age seconds. A revocation names either one token (its jti) or
+    every token a user was issued up to that moment, and is remembered only
+    until those tokens would have expired anyway, so the set stays small.
+    revocations defaults to MemoryRevocations; multi-worker servers need a
+    shared store such as DatabaseRevocations.
+    """
+
+    def __init__(self, secret_key, max_age=8 * 3600, revocations=None, salt="auth-token"):
+        self.max_age = max_age
+        self.revocations = revocations if revocations is not None else MemoryRevocations()
+        self._serializer = URLSafeTimedSerializer(secret_key, salt=salt)
+
+    def issue(self, users_id, role, email):
+        payload = {
+            "uid": str(users_id),
+            "role": role,
+            "email": email,
+            "jti": uuid.uuid4().hex,
+            "iat": int(time.time()),
+        }
+        return self._serializer.dumps(payload)
+
+    def verify(self, token):
+        """Return a TokenIdentity, or None if the token is invalid, expired or revoked."""
+        if not token:
+            return None
+        try:
+            payload = self._serializer.loads(token, max_age=self.max_age)
+            identity = TokenIdentity(uuid.UUID(payload["uid"]), payload["role"], payload.get("email"),
+                                     payload["jti"], payload["iat"])
+        except (BadSignature, SignatureExpired, KeyError, ValueError, TypeError):
+            return None
+        user_key = _user_key(identity.users_id)
+        revoked = self.revocations.lookup([identity.jti, user_key])
+        if identity.jti in revoked:
+            return None
+        # a user revocation expires max_age after it was made, and covers tokens issued until then
+        if user_key in revoked and identity.issued_at <= revoked[user_key] - self.max_age:
+            return None
+        return identity
+
+    def revoke(self, identity):
+        self.revocations.add(identity.jti, identity.issued_at + self.max_age)
+
+    def revoke_user(self, users_id):
+        """Revoke every token issued to users_id so far, e.g. when the account is deleted."""
+        self.revocations.add(_user_key(users_id), time.time() + self.max_age)
+
+
+def _user_key(users_id):
+    return f"user:{users_id}"
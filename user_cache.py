@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# What routes need to know about a user; a plain tuple so it can outlive the db session.
+# The password hash is deliberately left out: login reads it fresh from the row.
+CachedUser = namedtuple("CachedUser", ["users_id", "users_name", "users_email", "users_role"])
+
+
+class UserCache:
+    """LRU + TTL cache of user rows, addressable by users_id or by email.
+
+    Entries are stored once by users_id; the email map only points at ids, so
+    invalidating either key drops the user everywhere.
+
+    Lookups may pass a version, e.g. a shared counter that every write to the
+    users table bumps in its own transaction. An entry only hits at the
+    version it was loaded under, so a write made by another process, or one
+    that committed while a loader was still reading the old row, turns the
+    entry into a miss instead of serving it until the TTL runs out.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()   # users_id -> (CachedUser, expires_at, version)
+        self._email_index = {}          # users_email -> users_id
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, users_id, version):
+        entry = self._entries.get(users_id)
+        if entry is None:
+            return None
+        user, expires_at, entry_version = entry
+        if expires_at <= self._clock() or entry_version != version:
+            self._drop(users_id)
+            return None
+        self._entries.move_to_end(users_id)
+        return user
+
+    def _drop(self, users_id):
+        entry = self._entries.pop(users_id, None)
+        if entry is not None:
+            self._email_index.pop(entry[0].users_email, None)
+
+    def _store(self, user, version):
+        self._drop(user.users_id)
+        self._entries[user.users_id] = (user, self._clock() + self.ttl, version)
+        self._email_index[user.users_email] = user.users_id
+        while len(self._entries) > self.maxsize:
+            users_id, _ = self._entries.popitem(last=False)
+            self._drop(users_id)
+            self.evictions += 1
+
+    def _get(self, users_id, loader, version):
+        with self._lock:
+            user = self._lookup(users_id, version) if users_id is not None else None
+            if user is not None:
+                self.hits += 1
+                return user
+            self.misses += 1
+
+        # load outside the lock so a slow query doesn't block other lookups
+        user = loader()
+        if user is not None:
+            with self._lock:
+                self._store(user, version)
+        return user
+
+    def get_by_email(self, email, loader, version=None):
+        with self._lock:
+            users_id = self._email_index.get(email)
+        return self._get(users_id, loader, version)
+
+    def get_by_id(self, users_id, loader, version=None):
+        return self._get(users_id, loader, version)
+
+    def invalidate(self, users_id=None, email=None):
+        with self._lock:
+            if email is not None and users_id is None:
+                users_id = self._email_index.get(email)
+            if users_id is not None:
+                self._drop(users_id)
+            if email is not None:
+                self._email_index.pop(email, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._email_index.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
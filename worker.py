@@ -0,0 +1,40 @@
+"""Background job worker.
+
+    python worker.py            # run forever, polling for due jobs
+    python worker.py --once     # drain the due jobs and exit (handy against a throwaway database)
+"""
+import argparse
+import logging
+import os
+import signal
+import threading
+
+# jobs publish notifications from this process; only the postgres broker reaches
+# the SSE clients connected to the web processes
+os.environ.setdefault("NOTIFICATION_BROKER", "postgres")
+
+from api import app, job_queue  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued background jobs")
+    parser.add_argument("--once", action="store_true", help="exit when no due jobs are left")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds to sleep when the queue is empty")
+    args = parser.parse_args()
+    if app.config["NOTIFICATION_BROKER"] != "postgres":
+        parser.error("NOTIFICATION_BROKER must be 'postgres': with an in-process broker the worker's "
+                     "notifications never reach clients connected to the web server")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())  # finish the current job, then exit
+
+    with app.app_context():
+        processed = job_queue.run(poll_interval=args.poll_interval, once=args.once, stop=stop)
+    logging.info("Worker stopped after %d jobs", processed)
+
+
+if __name__ == "__main__":
+    main()